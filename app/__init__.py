@@ -1,50 +1,70 @@
 """
 Flask Application Factory
 """
-from flask import Flask
+import importlib
+import orjson
+from flask import Flask, request
 from flask_cors import CORS
 from app.config import Config
 from app.errors.handlers import register_error_handlers
+from app.utils.json_provider import ORJSONProvider
+from app.utils.logging_config import configure_logging
+
+# (module under app.routes, blueprint attribute, URL prefix)
+BLUEPRINTS = (
+    ('auth', 'auth_bp', '/api/auth'),
+    ('profile', 'profile_bp', '/api/profile'),
+    ('events', 'events_bp', '/api/events'),
+    ('rsvps', 'rsvps_bp', '/api/rsvps'),
+    ('groups', 'groups_bp', '/api/groups'),
+    ('chat', 'messages_bp', '/api/groups'),
+    ('batch', 'batch_bp', '/api/batch')
+)
+
+# Health check payload never changes, so serialize it once
+_HEALTH_BODY = orjson.dumps({
+    'success': True,
+    'message': 'EventSaga API is running',
+    'version': '1.0.0'
+})
+_HEALTH_RESPONSE = (_HEALTH_BODY, 200, {'Content-Type': 'application/json'})
 
 def create_app(config_class=Config):
     """Create and configure Flask application"""
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
     app.config.from_object(config_class)
+    config_class.validate()
+    configure_logging(app)
     
-    # Enable CORS for all routes
+    # Enable CORS for all routes (preflights cached by the browser for CORS_MAX_AGE)
     CORS(app, resources={
         r"/api/*": {
             "origins": "*",
             "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "allow_headers": ["Content-Type", "Authorization"],
+            "max_age": app.config['CORS_MAX_AGE']
         }
-    })
+    }, send_wildcard=True)
+    
+    # Answer CORS preflights before view dispatch; Flask-CORS adds the headers
+    @app.before_request
+    def short_circuit_preflight():
+        if request.method == 'OPTIONS' and request.path.startswith('/api/'):
+            return app.response_class(status=204)
     
     # Register error handlers
     register_error_handlers(app)
     
-    # Register blueprints
-    from app.routes.auth import auth_bp
-    from app.routes.profile import profile_bp
-    from app.routes.events import events_bp
-    from app.routes.rsvps import rsvps_bp
-    from app.routes.groups import groups_bp
-    from app.routes.chat import messages_bp
-    
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(profile_bp, url_prefix='/api/profile')
-    app.register_blueprint(events_bp, url_prefix='/api/events')
-    app.register_blueprint(rsvps_bp, url_prefix='/api/rsvps')
-    app.register_blueprint(groups_bp, url_prefix='/api/groups')
-    app.register_blueprint(messages_bp, url_prefix='/api/groups')
+    # Register blueprints (a config class can set e.g. ENABLE_CHAT = False to skip one)
+    for module_name, attr, url_prefix in BLUEPRINTS:
+        if app.config.get(f'ENABLE_{module_name.upper()}', True):
+            module = importlib.import_module(f'app.routes.{module_name}')
+            app.register_blueprint(getattr(module, attr), url_prefix=url_prefix)
     
     # Health check route
     @app.route('/api/health')
     def health_check():
-        return {
-            'success': True,
-            'message': 'EventSaga API is running',
-            'version': '1.0.0'
-        }, 200
+        return _HEALTH_RESPONSE
     
     return app
\ No newline at end of file
@@ -14,10 +14,13 @@ class Config:
     SUPABASE_URL = os.getenv('SUPABASE_URL')
     SUPABASE_ANON_KEY = os.getenv('SUPABASE_ANON_KEY')
     SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_KEY')
+    SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET')  # enables local token verification
+    
+    # CORS Configuration (seconds browsers may cache preflight responses)
+    CORS_MAX_AGE = int(os.getenv('CORS_MAX_AGE', 86400))
     
     # Flask Configuration
     JSON_SORT_KEYS = False
-    JSONIFY_PRETTYPRINT_REGULAR = True
     
     # Validate required environment variables
     @staticmethod
@@ -44,7 +47,4 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     """Testing configuration"""
     DEBUG = True
-    TESTING = True
-
-# Validate configuration on import
-Config.validate()
\ No newline at end of file
+    TESTING = True
\ No newline at end of file
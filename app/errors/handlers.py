@@ -3,10 +3,21 @@ Global Error Handlers
 """
 from flask import jsonify
 from werkzeug.exceptions import HTTPException
+from app.utils.responses import error_body
+
+# Fixed error payloads, serialized once so handlers can reuse the bytes
+_UNAUTHORIZED = error_body('Unauthorized', 'Authentication required')
+_FORBIDDEN = error_body('Forbidden', 'You do not have permission to access this resource')
+_NOT_FOUND = error_body('Not found', 'The requested resource was not found')
+_METHOD_NOT_ALLOWED = error_body('Method not allowed', 'The method is not allowed for the requested URL')
+_INTERNAL_ERROR = error_body('Internal server error', 'An unexpected error occurred')
 
 def register_error_handlers(app):
     """Register error handlers with Flask app"""
     
+    def static_response(body: bytes, status: int):
+        return app.response_class(body, status=status, mimetype='application/json')
+    
     @app.errorhandler(400)
     def bad_request(error):
         return jsonify({
@@ -17,43 +28,23 @@ def register_error_handlers(app):
     
     @app.errorhandler(401)
     def unauthorized(error):
-        return jsonify({
-            'success': False,
-            'error': 'Unauthorized',
-            'message': 'Authentication required'
-        }), 401
+        return static_response(_UNAUTHORIZED, 401)
     
     @app.errorhandler(403)
     def forbidden(error):
-        return jsonify({
-            'success': False,
-            'error': 'Forbidden',
-            'message': 'You do not have permission to access this resource'
-        }), 403
+        return static_response(_FORBIDDEN, 403)
     
     @app.errorhandler(404)
     def not_found(error):
-        return jsonify({
-            'success': False,
-            'error': 'Not found',
-            'message': 'The requested resource was not found'
-        }), 404
+        return static_response(_NOT_FOUND, 404)
     
     @app.errorhandler(405)
     def method_not_allowed(error):
-        return jsonify({
-            'success': False,
-            'error': 'Method not allowed',
-            'message': 'The method is not allowed for the requested URL'
-        }), 405
+        return static_response(_METHOD_NOT_ALLOWED, 405)
     
     @app.errorhandler(500)
     def internal_error(error):
-        return jsonify({
-            'success': False,
-            'error': 'Internal server error',
-            'message': 'An unexpected error occurred'
-        }), 500
+        return static_response(_INTERNAL_ERROR, 500)
     
     @app.errorhandler(HTTPException)
     def handle_http_exception(error):
@@ -66,10 +57,6 @@ def register_error_handlers(app):
     @app.errorhandler(Exception)
     def handle_unexpected_error(error):
         # Log the error for debugging
-        app.logger.error(f'Unhandled exception: {str(error)}', exc_info=True)
+        app.logger.error('Unhandled exception: %s', error, exc_info=True)
         
-        return jsonify({
-            'success': False,
-            'error': 'Internal server error',
-            'message': 'An unexpected error occurred'
-        }), 500
\ No newline at end of file
+        return static_response(_INTERNAL_ERROR, 500)
\ No newline at end of file
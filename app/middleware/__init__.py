@@ -1,10 +1,18 @@
 """
 Authentication and authorization middleware
 """
-from app.middleware.auth import require_auth, require_organizer, optional_auth
+from app.middleware.auth import (
+    require_auth,
+    require_organizer,
+    optional_auth,
+    invalidate_auth_cache,
+    invalidate_cached_profile
+)
 
 __all__ = [
     'require_auth',
     'require_organizer',
-    'optional_auth'
+    'optional_auth',
+    'invalidate_auth_cache',
+    'invalidate_cached_profile'
 ]
\ No newline at end of file
@@ -1,11 +1,103 @@
 """
 Authentication Middleware and Decorators
 """
+import base64
+import hashlib
+import json
+import re
+import time
+from contextlib import suppress
 from functools import wraps
-from flask import request, g
+from typing import Optional
+import jwt
+from flask import request, g, current_app
+from app.utils.cache import TTLCache, TieredCache
 from app.utils.supabase_client import get_supabase
 from app.utils.responses import error_response
 
+# Profile columns attached to g.user and returned by the auth endpoints
+PROFILE_COLS = 'id, email, name, role, avatar_url, created_at'
+
+# Supabase errors that mean the token itself was rejected
+_JWT_ERROR_RE = re.compile(r'invalid jwt|expired', re.IGNORECASE)
+
+# Verified tokens (token hash -> user id), so repeat requests skip Supabase
+AUTH_CACHE_TTL = 60
+_token_cache = TTLCache(maxsize=10_000, ttl=AUTH_CACHE_TTL)
+
+# Profiles keyed by user id: a small hot L1 for active users in front of a larger L2
+PROFILE_CACHE_TTL = 300
+_profile_cache = TieredCache(hot_size=512, maxsize=50_000, ttl=PROFILE_CACHE_TTL)
+
+def _token_key(token: str) -> bytes:
+    """Hash a token so raw JWTs are never kept in memory as cache keys"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def _token_ttl(token: str) -> float:
+    """
+    Seconds a verified token may stay cached
+    
+    Reads the (already verified) JWT's exp claim without re-checking the
+    signature, and clamps the cache TTL so expired tokens are never served.
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload))['exp']
+        return min(AUTH_CACHE_TTL, float(exp) - time.time())
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0
+
+def extract_bearer_token(auth_header: str) -> Optional[str]:
+    """Return the token from a "Bearer <token>" header, or None if malformed"""
+    if len(auth_header) < 8 or auth_header[:7].lower() != 'bearer ':
+        return None
+    
+    token = auth_header[7:].strip()
+    return token or None
+
+def _verify_token(token: str) -> Optional[str]:
+    """
+    Verify a Supabase access token and return its user id (None if rejected)
+    
+    Tokens are verified locally against SUPABASE_JWT_SECRET when it is set.
+    Supabase's auth endpoint is only called when no secret is configured or
+    the token can't be checked locally (e.g. it isn't HS256-signed).
+    """
+    secret = current_app.config.get('SUPABASE_JWT_SECRET')
+    
+    if secret:
+        try:
+            claims = jwt.decode(token, secret, algorithms=['HS256'], audience='authenticated')
+            return claims.get('sub')
+        except (jwt.ExpiredSignatureError, jwt.InvalidSignatureError, jwt.InvalidAudienceError):
+            return None
+        except jwt.InvalidTokenError:
+            pass
+    
+    response = get_supabase().auth.get_user(token)
+    return response.user.id if response and response.user else None
+
+def _cached_user(token: str) -> Optional[dict]:
+    """Return the cached profile for a recently verified token"""
+    user_id = _token_cache.get(_token_key(token))
+    return _profile_cache.get(user_id) if user_id else None
+
+def _cache_user(token: str, user: dict):
+    """Cache a verified token (for its remaining lifetime) and its user's profile"""
+    ttl = _token_ttl(token)
+    if ttl > 0:
+        _token_cache.set(_token_key(token), user['id'], ttl=ttl)
+        _profile_cache.set(user['id'], user)
+
+def invalidate_auth_cache(token: str):
+    """Forget that a token was verified (call on logout)"""
+    _token_cache.pop(_token_key(token))
+
+def invalidate_cached_profile(user_id: str):
+    """Drop a user's cached profile (call after the profile changes)"""
+    _profile_cache.pop(user_id)
+
 def require_auth(f):
     """
     Decorator to require authentication for a route
@@ -29,23 +121,27 @@ def require_auth(f):
             return error_response('Authorization header is required', 401)
         
         # Extract token from "Bearer <token>"
-        parts = auth_header.split()
-        if len(parts) != 2 or parts[0].lower() != 'bearer':
+        token = extract_bearer_token(auth_header)
+        if not token:
             return error_response('Invalid authorization header format. Use: Bearer <token>', 401)
         
-        token = parts[1]
+        # Serve recently verified tokens from cache
+        cached_user = _cached_user(token)
+        if cached_user is not None:
+            g.user = cached_user
+            g.token = token
+            return f(*args, **kwargs)
         
         try:
-            # Verify token with Supabase
-            supabase = get_supabase()
-            response = supabase.auth.get_user(token)
+            # Verify token (locally when the JWT secret is configured)
+            user_id = _verify_token(token)
             
-            if not response or not response.user:
+            if not user_id:
                 return error_response('Invalid or expired token', 401)
             
             # Get user profile from database
-            user_id = response.user.id
-            profile_response = supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+            supabase = get_supabase()
+            profile_response = supabase.table('profiles').select(PROFILE_COLS).eq('id', user_id).single().execute()
             
             if not profile_response.data:
                 return error_response('User profile not found', 404)
@@ -53,12 +149,13 @@ def require_auth(f):
             # Attach user to Flask g object
             g.user = profile_response.data
             g.token = token
+            _cache_user(token, profile_response.data)
             
             return f(*args, **kwargs)
             
         except Exception as e:
             error_message = str(e)
-            if 'invalid JWT' in error_message.lower() or 'expired' in error_message.lower():
+            if _JWT_ERROR_RE.search(error_message):
                 return error_response('Invalid or expired token', 401)
             
             return error_response(f'Authentication failed: {error_message}', 401)
@@ -116,30 +213,27 @@ def optional_auth(f):
             g.user = None
             return f(*args, **kwargs)
         
-        parts = auth_header.split()
-        if len(parts) != 2 or parts[0].lower() != 'bearer':
+        token = extract_bearer_token(auth_header)
+        if not token:
             g.user = None
             return f(*args, **kwargs)
         
-        token = parts[1]
+        # Fast path: token already verified recently
+        g.user = _cached_user(token)
+        if g.user is not None:
+            return f(*args, **kwargs)
         
-        try:
-            supabase = get_supabase()
-            response = supabase.auth.get_user(token)
+        # Any verification or lookup failure leaves the request anonymous
+        with suppress(Exception):
+            user_id = _verify_token(token)
             
-            if response and response.user:
-                user_id = response.user.id
-                profile_response = supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+            if user_id:
+                supabase = get_supabase()
+                profile_response = supabase.table('profiles').select(PROFILE_COLS).eq('id', user_id).single().execute()
                 
                 if profile_response.data:
                     g.user = profile_response.data
-                else:
-                    g.user = None
-            else:
-                g.user = None
-                
-        except Exception:
-            g.user = None
+                    _cache_user(token, profile_response.data)
         
         return f(*args, **kwargs)
     
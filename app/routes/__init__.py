@@ -1,10 +1,30 @@
+"""
+Route blueprints
 
-from app.routes.auth import auth_bp
-from app.routes.profile import profile_bp
-from app.routes.events import events_bp
-from app.routes.rsvps import rsvps_bp
-from app.routes.chat import messages_bp
-from app.routes.groups import groups_bp
+Blueprints are imported lazily on first attribute access (PEP 562) so that
+importing the package does not pull in the Supabase client for every route.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.routes.auth import auth_bp
+    from app.routes.profile import profile_bp
+    from app.routes.events import events_bp
+    from app.routes.rsvps import rsvps_bp
+    from app.routes.chat import messages_bp
+    from app.routes.groups import groups_bp
+    from app.routes.batch import batch_bp
+
+_LAZY = {
+    'auth_bp': 'app.routes.auth',
+    'profile_bp': 'app.routes.profile',
+    'events_bp': 'app.routes.events',
+    'rsvps_bp': 'app.routes.rsvps',
+    'messages_bp': 'app.routes.chat',
+    'groups_bp': 'app.routes.groups',
+    'batch_bp': 'app.routes.batch'
+}
 
 __all__ = [
     'auth_bp',
@@ -12,5 +32,15 @@ __all__ = [
     'events_bp',
     'rsvps_bp',
     'messages_bp',
-    'groups_bp'
-]
\ No newline at end of file
+    'groups_bp',
+    'batch_bp'
+]
+
+def __getattr__(name):
+    """Import a blueprint module on first access"""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    blueprint = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = blueprint
+    return blueprint
@@ -2,20 +2,41 @@
 Authentication Routes
 Handles user signup, login, logout, and token management
 """
-from flask import Blueprint, request, g
+import re
+from flask import Blueprint, request, g, current_app
 from app.utils.supabase_client import get_supabase
-from app.utils.responses import success_response, error_response, validation_error
+from app.utils.responses import success_response, ok, error_response, validation_error
 from app.utils.validators import (
     validate_email, 
     validate_password, 
     validate_name, 
     validate_role,
-    validate_required_fields
+    make_required_validator
 )
-from app.middleware.auth import require_auth
+from app.middleware.auth import require_auth, invalidate_auth_cache, PROFILE_COLS
 
 auth_bp = Blueprint('auth', __name__)
 
+# Supabase error message classifiers
+_DUPLICATE_EMAIL_RE = re.compile(r'already registered|already exists|duplicate', re.IGNORECASE)
+_BAD_CREDENTIALS_RE = re.compile(r'invalid|credentials', re.IGNORECASE)
+_BAD_REFRESH_RE = re.compile(r'invalid|expired', re.IGNORECASE)
+
+# Required-field checks, with their error messages built once
+_validate_signup_required = make_required_validator(('email', 'password', 'name', 'role'))
+_validate_login_required = make_required_validator(('email', 'password'))
+
+# PROFILE_COLS as field names, to trim full profile rows to the same shape
+_PROFILE_FIELDS = tuple(col.strip() for col in PROFILE_COLS.split(','))
+
+# (field, validator) pairs checked by signup
+_SIGNUP_VALIDATORS = (
+    ('email', validate_email),
+    ('password', validate_password),
+    ('name', validate_name),
+    ('role', validate_role)
+)
+
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
     """
@@ -40,37 +61,33 @@ def signup():
             return error_response('Request body is required', 400)
         
         # Validate required fields
-        required_fields = ['email', 'password', 'name', 'role']
-        field_errors = validate_required_fields(data, required_fields)
+        field_errors = _validate_signup_required(data)
         
         if field_errors:
             return validation_error(field_errors)
         
-        # Extract and validate individual fields
-        email = data.get('email', '').strip()
-        password = data.get('password', '')
-        name = data.get('name', '').strip()
-        role = data.get('role', '').strip().lower()
-        
-        # Validate email
-        email_valid, email_error = validate_email(email)
-        if not email_valid:
-            return validation_error({'email': email_error})
+        # Extract and normalize individual fields
+        fields = {
+            'email': data['email'].strip(),
+            'password': data['password'],
+            'name': data['name'].strip(),
+            'role': data['role'].strip().lower()
+        }
         
-        # Validate password
-        password_valid, password_error = validate_password(password)
-        if not password_valid:
-            return validation_error({'password': password_error})
+        # Validate all fields in one pass and report every error at once
+        errors = {}
+        for field, validator in _SIGNUP_VALIDATORS:
+            is_valid, error = validator(fields[field])
+            if not is_valid:
+                errors[field] = error
         
-        # Validate name
-        name_valid, name_error = validate_name(name)
-        if not name_valid:
-            return validation_error({'name': name_error})
+        if errors:
+            return validation_error(errors)
         
-        # Validate role
-        role_valid, role_error = validate_role(role)
-        if not role_valid:
-            return validation_error({'role': role_error})
+        email = fields['email']
+        password = fields['password']
+        name = fields['name']
+        role = fields['role']
         
         # Create user in Supabase Auth
         supabase = get_supabase()
@@ -92,22 +109,31 @@ def signup():
         
         user_id = auth_response.user.id
         
-        # Update the profile with the correct role (trigger creates profile with default role)
+        # Update the profile with the correct role (trigger creates profile with default role).
+        # The update returns the updated row, so no separate fetch is needed. The row
+        # has every column, so it is trimmed to PROFILE_COLS like the fallback fetch.
+        profile = None
         try:
-            supabase.table('profiles').update({
+            update_response = supabase.table('profiles').update({
                 'role': role,
                 'name': name
             }).eq('id', user_id).execute()
+            
+            if update_response.data:
+                row = update_response.data[0]
+                profile = {field: row.get(field) for field in _PROFILE_FIELDS}
         except Exception as profile_error:
-            print(f"Warning: Profile update failed: {profile_error}")
+            current_app.logger.warning('Profile update failed for %s', user_id, exc_info=profile_error)
             # Continue anyway - profile might have been created by trigger
         
-        # Fetch complete user profile
-        profile_response = supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+        # Fetch the profile only if the update didn't return it
+        if profile is None:
+            profile_response = supabase.table('profiles').select(PROFILE_COLS).eq('id', user_id).single().execute()
+            profile = profile_response.data
         
         # Prepare response data
         response_data = {
-            'user': profile_response.data if profile_response.data else {
+            'user': profile if profile else {
                 'id': user_id,
                 'email': email,
                 'name': name,
@@ -137,11 +163,11 @@ def signup():
         error_str = str(e)
         
         # Handle duplicate email error
-        if 'already registered' in error_str.lower() or 'already exists' in error_str.lower() or 'duplicate' in error_str.lower():
+        if _DUPLICATE_EMAIL_RE.search(error_str):
             return error_response('Email already registered', 400)
         
         # Log full error for debugging
-        print(f"Signup error: {error_str}")
+        current_app.logger.exception('Signup error')
         
         # Handle other errors
         return error_response(f'Registration failed: {error_str}', 500)
@@ -168,8 +194,7 @@ def login():
             return error_response('Request body is required', 400)
         
         # Validate required fields
-        required_fields = ['email', 'password']
-        field_errors = validate_required_fields(data, required_fields)
+        field_errors = _validate_login_required(data)
         
         if field_errors:
             return validation_error(field_errors)
@@ -195,7 +220,7 @@ def login():
         
         # Fetch user profile
         user_id = auth_response.user.id
-        profile_response = supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+        profile_response = supabase.table('profiles').select(PROFILE_COLS).eq('id', user_id).single().execute()
         
         if not profile_response.data:
             return error_response('User profile not found', 404)
@@ -216,7 +241,7 @@ def login():
         error_str = str(e)
         
         # Handle invalid credentials
-        if 'invalid' in error_str.lower() or 'credentials' in error_str.lower():
+        if _BAD_CREDENTIALS_RE.search(error_str):
             return error_response('Invalid email or password', 401)
         
         return error_response(f'Login failed: {error_str}', 500)
@@ -236,6 +261,7 @@ def logout():
     try:
         supabase = get_supabase()
         supabase.auth.sign_out()
+        invalidate_auth_cache(g.token)
         
         return success_response(message='Logout successful')
         
@@ -252,12 +278,19 @@ def get_current_user():
         Authorization: Bearer <jwt_token>
     
     Returns:
-        200: User profile data
+        200: User profile data (every profile column)
         401: Invalid or expired token
+        404: Profile not found
     """
     try:
-        # User data is already attached by @require_auth decorator
-        return success_response(data=g.user)
+        # g.user only carries PROFILE_COLS, so read the full profile here
+        supabase = get_supabase()
+        profile_response = supabase.table('profiles').select('*').eq('id', g.user['id']).maybe_single().execute()
+        
+        if not profile_response or not profile_response.data:
+            return error_response('User profile not found', 404)
+        
+        return ok(profile_response.data)
         
     except Exception as e:
         return error_response(f'Failed to fetch user: {str(e)}', 500)
@@ -307,7 +340,7 @@ def refresh_token():
     except Exception as e:
         error_str = str(e)
         
-        if 'invalid' in error_str.lower() or 'expired' in error_str.lower():
+        if _BAD_REFRESH_RE.search(error_str):
             return error_response('Invalid or expired refresh token', 400)
         
         return error_response(f'Token refresh failed: {error_str}', 500)
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Batch Routes
+Runs several API calls in one HTTP request
+"""
+import orjson
+from flask import Blueprint, request, current_app
+from werkzeug.test import EnvironBuilder
+from app.utils.responses import ok, error_response, validation_error
+from app.middleware.auth import extract_bearer_token
+
+batch_bp = Blueprint('batch', __name__)
+
+MAX_BATCH_OPERATIONS = 20
+_BATCH_METHODS = frozenset(('GET', 'POST', 'PUT', 'PATCH', 'DELETE'))
+
+# Outer request headers not passed on to operations: each sets its own
+# credentials and body, and must not be revalidated against the batch's ETags
+_OPERATION_HEADER_SKIP = frozenset(('authorization', 'content-type', 'content-length', 'if-none-match'))
+
+# Connection details copied from the outer environ (client address, protocol)
+_OPERATION_ENVIRON_KEYS = ('REMOTE_ADDR', 'REMOTE_PORT', 'SERVER_PROTOCOL')
+
+def _validate_operation(index: int, operation) -> str:
+    """Return an error message for a malformed operation, or '' if it is valid"""
+    if not isinstance(operation, dict):
+        return f'Operation {index}: Must be an object'
+    
+    method = operation.get('method')
+    if not isinstance(method, str) or method.upper() not in _BATCH_METHODS:
+        return f'Operation {index}: Method must be one of {", ".join(sorted(_BATCH_METHODS))}'
+    
+    path = operation.get('path')
+    if not isinstance(path, str) or not path.startswith('/api/') or path.startswith('/api/batch'):
+        return f'Operation {index}: Path must be an /api/ route other than /api/batch'
+    
+    input_from = operation.get('input_from')
+    if input_from is not None and (type(input_from) is not int or not 0 <= input_from < index):
+        return f'Operation {index}: input_from must be the index of an earlier operation'
+    
+    return ''
+
+def _operation_environ(method: str, path: str, body, token) -> dict:
+    """Build an operation's WSGI environ from the outer request's, with its own path, body and token"""
+    outer = request.environ
+    headers = [(key, value) for key, value in request.headers if key.lower() not in _OPERATION_HEADER_SKIP]
+    if token:
+        headers.append(('Authorization', f'Bearer {token}'))
+    
+    builder = EnvironBuilder(
+        path=path,
+        method=method,
+        json=body,
+        headers=headers,
+        base_url=request.host_url,
+        environ_base={key: outer[key] for key in _OPERATION_ENVIRON_KEYS if key in outer}
+    )
+    try:
+        return builder.get_environ()
+    finally:
+        builder.close()
+
+def _run_operation(method: str, path: str, body, token):
+    """Dispatch one operation through the app in its own app and request context"""
+    environ = _operation_environ(method, path, body, token)
+    
+    # A fresh app context gives each operation its own g (no auth state leaks between them)
+    with current_app.app_context(), current_app.request_context(environ):
+        response = current_app.full_dispatch_request()
+        payload = response.get_data()
+    
+    if response.is_json and payload:
+        return response.status_code, orjson.loads(payload)
+    return response.status_code, payload.decode(errors='replace')
+
+@batch_bp.route('', methods=['POST'])
+def run_batch():
+    """
+    Run several API calls in order in one request
+    
+    Each operation is dispatched exactly as if it had been sent on its own,
+    from the batch request's client and with its headers (other than
+    Authorization and the body headers).
+    An operation naming an earlier one in input_from picks up that result's
+    access token (data.session.access_token) for its Authorization header,
+    and its data.id in place of "{id}" in its path. Without input_from, the
+    batch request's own bearer token is used.
+    
+    Request Body:
+        [
+            {"method": "POST", "path": "/api/auth/signup", "body": {...}},
+            {"method": "POST", "path": "/api/events", "body": {...}, "input_from": 0},
+            {"method": "POST", "path": "/api/rsvps/{id}", "input_from": 1}
+        ]
+    
+    Returns:
+        200: One {"status", "body"} result per operation, in order
+             (424 for operations whose input_from operation failed)
+        400: Validation error (empty, too many, or malformed operations)
+    """
+    try:
+        operations = request.get_json()
+        
+        if not operations:
+            return error_response('Request body is required', 400)
+        
+        if not isinstance(operations, list):
+            return validation_error({'operations': 'Request body must be a list of operations'})
+        
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            return validation_error({'operations': f'At most {MAX_BATCH_OPERATIONS} operations can be batched'})
+        
+        # Validate every operation before running any of them
+        for index, operation in enumerate(operations):
+            operation_error = _validate_operation(index, operation)
+            if operation_error:
+                return validation_error({'operations': operation_error})
+        
+        batch_token = extract_bearer_token(request.headers.get('Authorization', ''))
+        
+        results = []
+        tokens = []
+        for index, operation in enumerate(operations):
+            path = operation['path']
+            token = batch_token
+            input_from = operation.get('input_from')
+            
+            if input_from is not None:
+                source = results[input_from]
+                if source['status'] >= 400:
+                    results.append({
+                        'status': 424,
+                        'body': {'success': False, 'error': f'Operation {input_from} failed'}
+                    })
+                    tokens.append(None)
+                    continue
+                
+                token = tokens[input_from]
+                source_data = source['body'].get('data') if isinstance(source['body'], dict) else None
+                if isinstance(source_data, dict) and source_data.get('id'):
+                    path = path.replace('{id}', str(source_data['id']))
+            
+            status, body = _run_operation(operation['method'].upper(), path, operation.get('body'), token)
+            
+            # A signup or login result carries a session: later operations act as that user
+            data = body.get('data') if isinstance(body, dict) else None
+            session = data.get('session') if isinstance(data, dict) else None
+            if isinstance(session, dict) and session.get('access_token'):
+                token = session['access_token']
+            
+            results.append({'status': status, 'body': body})
+            tokens.append(token)
+        
+        return ok({'results': results, 'count': len(results)})
+    
+    except Exception as e:
+        return error_response(f'Batch failed: {str(e)}', 500)
@@ -4,12 +4,29 @@ Handles real-time chat messaging within groups
 """
 from flask import Blueprint, request, g
 from app.utils.supabase_client import get_supabase, get_supabase_admin
-from app.utils.responses import success_response, error_response, validation_error
-from app.utils.validators import validate_required_fields, validate_uuid
+from app.utils.responses import success_response, ok, error_response, validation_error, conditional_response
+from app.utils.validators import make_required_validator, validate_uuid, validate_uuids
+from app.utils.membership import get_member_role
+from app.utils.pagination import page_limit, encode_cursor, decode_cursor, keyset_filter
 from app.middleware.auth import require_auth
 
 messages_bp = Blueprint('messages', __name__)
 
+_validate_message_required = make_required_validator(('content',))
+
+# Most messages accepted by one bulk send
+MAX_BULK_MESSAGES = 50
+
+def _content_error(content: str):
+    """Return the validation error for stripped message content, or None if it is valid"""
+    if len(content) < 1:
+        return 'Message cannot be empty'
+    
+    if len(content) > 2000:
+        return 'Message must not exceed 2000 characters'
+    
+    return None
+
 @messages_bp.route('/<group_id>/messages', methods=['GET'])
 @require_auth
 def get_messages(group_id):
@@ -24,7 +41,7 @@ def get_messages(group_id):
     
     Query Parameters:
         limit: Number of messages to fetch (default: 50, max: 100)
-        before: Fetch messages before this message ID (for pagination)
+        before: Cursor from a previous page's next_cursor (fetches older messages)
     
     Returns:
         200: List of messages with sender info
@@ -37,65 +54,48 @@ def get_messages(group_id):
         if not uuid_valid:
             return error_response(uuid_error, 400)
         
-        supabase = get_supabase()
-        
         # Check if user is a member of the group
-        membership = supabase.table('group_members').select('id').eq('group_id', group_id).eq('user_id', g.user['id']).execute()
-        
-        if not membership.data or len(membership.data) == 0:
+        if not get_member_role(group_id, g.user['id']):
             return error_response('You must be a member of this group to view messages', 403)
         
-        # Get pagination parameters
-        limit = request.args.get('limit', 50, type=int)
-        before_id = request.args.get('before', None)
+        supabase = get_supabase()
         
-        # Validate limit
-        if limit < 1:
-            limit = 50
-        if limit > 100:
-            limit = 100
+        # Get pagination parameters
+        limit = page_limit()
+        before = request.args.get('before', None)
         
         # Build query
-        query = supabase.table('messages').select('*, profiles!messages_user_id_fkey(id, name, avatar_url)')
+        query = supabase.table('messages').select('id, content, created_at, sender:profiles!messages_user_id_fkey(id, name, avatar_url)')
         query = query.eq('group_id', group_id)
         query = query.eq('is_deleted', False)
         
-        # Add pagination
-        if before_id:
-            # Validate before_id UUID
-            before_valid, before_error = validate_uuid(before_id)
-            if before_valid:
-                # Get the timestamp of the before message
-                before_msg = supabase.table('messages').select('created_at').eq('id', before_id).execute()
-                if before_msg.data:
-                    query = query.lt('created_at', before_msg.data[0]['created_at'])
+        # Keyset pagination on (created_at, id): strictly older than the cursor
+        if before:
+            cursor = decode_cursor(before)
+            if not cursor:
+                return error_response('Invalid pagination cursor', 400)
+            
+            query = query.or_(keyset_filter('created_at', *cursor))
         
-        # Order by newest first and limit
-        query = query.order('created_at', desc=True).limit(limit)
+        # Order by newest first (id breaks timestamp ties) and limit
+        query = query.order('created_at', desc=True).order('id', desc=True).limit(limit)
         
         # Execute query
         response = query.execute()
-        messages = response.data
-        
-        # Reverse to show oldest first
-        messages.reverse()
-        
-        # Format messages
-        formatted_messages = []
-        for msg in messages:
-            message_data = {
-                'id': msg['id'],
-                'content': msg['content'],
-                'created_at': msg['created_at'],
-                'sender': msg['profiles'] if msg.get('profiles') else None
-            }
-            formatted_messages.append(message_data)
-        
-        return success_response(data={
+        
+        # Rows already have the response shape (sender is aliased in the select);
+        # reverse to show oldest first
+        formatted_messages = response.data[::-1]
+        
+        has_more = len(formatted_messages) == limit
+        
+        # Polling clients get a 304 when nothing changed since their last fetch
+        return conditional_response(ok({
             'messages': formatted_messages,
             'count': len(formatted_messages),
-            'has_more': len(formatted_messages) == limit
-        })
+            'has_more': has_more,
+            'next_cursor': encode_cursor(formatted_messages[0]['created_at'], formatted_messages[0]['id']) if has_more else None
+        }))
         
     except Exception as e:
         return error_response(f'Failed to fetch messages: {str(e)}', 500)
@@ -135,8 +135,7 @@ def send_message(group_id):
             return error_response('Request body is required', 400)
         
         # Validate required fields
-        required_fields = ['content']
-        field_errors = validate_required_fields(data, required_fields)
+        field_errors = _validate_message_required(data)
         
         if field_errors:
             return validation_error(field_errors)
@@ -144,53 +143,113 @@ def send_message(group_id):
         content = data['content'].strip()
         
         # Validate content
-        if len(content) < 1:
-            return validation_error({'content': 'Message cannot be empty'})
-        
-        if len(content) > 2000:
-            return validation_error({'content': 'Message must not exceed 2000 characters'})
+        content_error = _content_error(content)
+        if content_error:
+            return validation_error({'content': content_error})
         
-        supabase = get_supabase()
+        # Membership check, insert and sender lookup run in one round trip.
+        # USE ADMIN CLIENT: the function trusts p_user, so only the service role may call it
+        supabase_admin = get_supabase_admin()
+        response = supabase_admin.rpc('send_message', {
+            'p_group': group_id,
+            'p_user': g.user['id'],
+            'p_content': content
+        }).execute()
         
-        # Check if user is a member of the group
-        membership = supabase.table('group_members').select('id').eq('group_id', group_id).eq('user_id', g.user['id']).execute()
+        formatted_message = response.data
         
-        if not membership.data or len(membership.data) == 0:
+        if not formatted_message:
             return error_response('You must be a member of this group to send messages', 403)
         
-        # Create message - USE ADMIN CLIENT to bypass RLS
-        message_data = {
-            'group_id': group_id,
-            'user_id': g.user['id'],
-            'content': content
+        return success_response(
+            data=formatted_message,
+            message='Message sent successfully',
+            status=201
+        )
+        
+    except Exception as e:
+        return error_response(f'Failed to send message: {str(e)}', 500)
+
+@messages_bp.route('/<group_id>/messages/bulk', methods=['POST'])
+@require_auth
+def send_messages(group_id):
+    """
+    Send several messages to a group in one request
+    
+    Headers:
+        Authorization: Bearer <jwt_token>
+    
+    URL Parameters:
+        group_id: Group UUID
+    
+    Request Body:
+        {
+            "messages": [{"content": "Hello"}, {"content": "everyone!"}]
         }
+    
+    Returns:
+        201: Messages sent successfully (in send order)
+        400: Validation error (no messages, too many, or an invalid message)
+        403: Not a member of this group
+    """
+    try:
+        # Validate UUID
+        uuid_valid, uuid_error = validate_uuid(group_id)
+        if not uuid_valid:
+            return error_response(uuid_error, 400)
         
-        supabase_admin = get_supabase_admin()
-        response = supabase_admin.table('messages').insert(message_data).execute()
+        data = request.get_json()
         
-        if not response.data:
-            return error_response('Failed to send message', 500)
+        if not data:
+            return error_response('Request body is required', 400)
         
-        message = response.data[0]
+        messages = data.get('messages')
+        
+        if not isinstance(messages, list) or not messages:
+            return validation_error({'messages': 'Messages must be a non-empty list'})
+        
+        if len(messages) > MAX_BULK_MESSAGES:
+            return validation_error({'messages': f'At most {MAX_BULK_MESSAGES} messages can be sent at once'})
+        
+        # Validate every message before inserting any of them
+        contents = []
+        for index, message in enumerate(messages, 1):
+            content = message.get('content') if isinstance(message, dict) else None
+            if not isinstance(content, str):
+                return validation_error({'messages': f'Message {index}: Content is required'})
+            
+            content = content.strip()
+            content_error = _content_error(content)
+            if content_error:
+                return validation_error({'messages': f'Message {index}: {content_error}'})
+            
+            contents.append(content)
+        
+        # Membership check and a single multi-row insert in one round trip.
+        # USE ADMIN CLIENT: the function trusts p_user
+        supabase_admin = get_supabase_admin()
+        response = supabase_admin.rpc('send_messages', {
+            'p_group': group_id,
+            'p_user': g.user['id'],
+            'p_contents': contents
+        }).execute()
         
-        # Fetch sender info
-        sender_response = supabase.table('profiles').select('id, name, avatar_url').eq('id', g.user['id']).execute()
+        sent_messages = response.data
         
-        formatted_message = {
-            'id': message['id'],
-            'content': message['content'],
-            'created_at': message['created_at'],
-            'sender': sender_response.data[0] if sender_response.data else None
-        }
+        if sent_messages is None:
+            return error_response('You must be a member of this group to send messages', 403)
         
         return success_response(
-            data=formatted_message,
-            message='Message sent successfully',
+            data={
+                'messages': sent_messages,
+                'count': len(sent_messages)
+            },
+            message='Messages sent successfully',
             status=201
         )
         
     except Exception as e:
-        return error_response(f'Failed to send message: {str(e)}', 500)
+        return error_response(f'Failed to send messages: {str(e)}', 500)
 
 @messages_bp.route('/<group_id>/messages/<message_id>', methods=['DELETE'])
 @require_auth
@@ -213,37 +272,25 @@ def delete_message(group_id, message_id):
     """
     try:
         # Validate UUIDs
-        uuid_valid, uuid_error = validate_uuid(group_id)
+        uuid_valid, uuid_error = validate_uuids(group_id, message_id)
         if not uuid_valid:
             return error_response(uuid_error, 400)
         
-        msg_valid, msg_error = validate_uuid(message_id)
-        if not msg_valid:
-            return error_response(msg_error, 400)
-        
-        supabase = get_supabase()
-        
-        # Check if message exists
-        message_response = supabase.table('messages').select('*').eq('id', message_id).eq('group_id', group_id).execute()
+        # Existence check, sender/admin authorization and soft delete run in one
+        # round trip. USE ADMIN CLIENT: the function trusts p_user
+        supabase_admin = get_supabase_admin()
+        response = supabase_admin.rpc('delete_message', {
+            'p_message': message_id,
+            'p_group': group_id,
+            'p_user': g.user['id']
+        }).execute()
         
-        if not message_response.data or len(message_response.data) == 0:
+        if response.data == 'not_found':
             return error_response('Message not found', 404)
         
-        message = message_response.data[0]
-        
-        # Check if user is the sender or a group admin
-        is_sender = message['user_id'] == g.user['id']
-        
-        membership = supabase.table('group_members').select('role').eq('group_id', group_id).eq('user_id', g.user['id']).execute()
-        is_admin = membership.data and membership.data[0]['role'] == 'admin'
-        
-        if not is_sender and not is_admin:
+        if response.data == 'forbidden':
             return error_response('You can only delete your own messages or if you are a group admin', 403)
         
-        # Soft delete message - USE ADMIN CLIENT to bypass RLS
-        supabase_admin = get_supabase_admin()
-        supabase_admin.table('messages').update({'is_deleted': True}).eq('id', message_id).execute()
-        
         return success_response(message='Message deleted successfully')
         
     except Exception as e:
@@ -3,18 +3,140 @@ Event Routes - MVP Version
 Handles event discovery, creation, and management
 """
 from flask import Blueprint, request, g
-from datetime import datetime
-from app.utils.supabase_client import get_supabase, get_supabase_admin
-from app.utils.responses import success_response, error_response, validation_error
+from app.utils.supabase_client import get_supabase, get_supabase_admin, APIError, NO_ROWS
+from app.utils.responses import success_response, ok, error_response, validation_error, conditional_response
+from app.utils.cache import TTLCache
+from app.utils.concurrency import run_concurrently
+from app.utils.pagination import MAX_PAGE_SIZE
+from app.utils.rsvp_counts import RSVP_COUNT_SELECT, flatten_rsvp_count
 from app.utils.validators import (
-    validate_required_fields,
+    make_required_validator,
     validate_uuid,
+    validate_uuids,
     validate_event_data
 )
 from app.middleware.auth import require_auth, require_organizer, optional_auth
 
 events_bp = Blueprint('events', __name__)
 
+# Allowed event categories and statuses (ordered tuple kept for error messages)
+_CATEGORY_NAMES = ('music', 'tech', 'sports', 'food', 'arts', 'business', 'workshop', 'networking', 'entertainment', 'other')
+VALID_CATEGORIES = frozenset(_CATEGORY_NAMES)
+VALID_STATUSES = frozenset({'active', 'canceled', 'completed'})
+_CATEGORY_ERROR = f'Category must be one of: {", ".join(_CATEGORY_NAMES)}'
+
+_validate_event_required = make_required_validator(('title', 'description', 'datetime', 'location', 'city', 'category'))
+
+# Most events accepted by one bulk create
+MAX_BULK_EVENTS = 50
+
+# Anonymous listings change on the order of minutes, so short-lived copies
+# absorb repeated reads. Keyed by (city, category, search, ids) and 'trending'.
+LISTING_CACHE_TTL = 60
+TRENDING_CACHE_TTL = 120
+_listing_cache = TTLCache(maxsize=1024, ttl=LISTING_CACHE_TTL)
+
+def _text(min_length=0, label=''):
+    """Parser for a required text field: stripped, optionally with a minimum length"""
+    def parse(value):
+        value = value.strip()
+        if len(value) < min_length:
+            raise ValueError(f'{label} must be at least {min_length} characters')
+        return value
+    return parse
+
+def _optional_text(value):
+    """Parser for a nullable text field: stripped, or None when empty"""
+    return value.strip() if value else None
+
+def _choice(choices, message):
+    """Parser for a lower-cased field restricted to a set of choices"""
+    def parse(value):
+        value = value.lower().strip()
+        if value not in choices:
+            raise ValueError(message)
+        return value
+    return parse
+
+def _capacity(value):
+    """Parser for a positive integer capacity"""
+    try:
+        capacity = int(value)
+    except (ValueError, TypeError):
+        raise ValueError('Capacity must be a valid number')
+    
+    if capacity < 1:
+        raise ValueError('Capacity must be at least 1')
+    return capacity
+
+# Fields update_event accepts, each with a parser that normalizes the value
+# or raises ValueError with the message to report
+_EVENT_UPDATE_FIELDS = {
+    'title': _text(3, 'Title'),
+    'description': _text(10, 'Description'),
+    'datetime': lambda value: value,
+    'end_datetime': lambda value: value,
+    'location': _text(),
+    'city': _text(),
+    'address': _optional_text,
+    'category': _choice(VALID_CATEGORIES, _CATEGORY_ERROR),
+    'image_url': _optional_text,
+    'capacity': _capacity,
+    'status': _choice(VALID_STATUSES, 'Status must be active, canceled, or completed')
+}
+
+def _new_event_row(data, organizer_id):
+    """
+    Validate a create-event payload and build the row to insert
+    
+    Args:
+        data: Request payload for one event
+        organizer_id: Creating organizer's user id
+    
+    Returns:
+        Tuple of (row, None) when valid, or (None, field errors)
+    """
+    # Validate required fields
+    field_errors = _validate_event_required(data)
+    
+    if field_errors:
+        return None, field_errors
+    
+    # Validate event data
+    is_valid, errors = validate_event_data(data)
+    if not is_valid:
+        return None, errors
+    
+    # Prepare event data
+    event_data = {
+        'organizer_id': organizer_id,
+        'title': data['title'].strip(),
+        'description': data['description'].strip(),
+        'datetime': data['datetime'],
+        'location': data['location'].strip(),
+        'city': data['city'].strip(),
+        'category': data['category'].lower().strip(),
+        'status': 'active'
+    }
+    
+    # Add optional fields
+    if data.get('end_datetime'):
+        event_data['end_datetime'] = data['end_datetime']
+    
+    if data.get('address'):
+        event_data['address'] = data['address'].strip()
+    
+    if data.get('image_url'):
+        event_data['image_url'] = data['image_url'].strip()
+    
+    if data.get('capacity'):
+        try:
+            event_data['capacity'] = _capacity(data['capacity'])
+        except ValueError as e:
+            return None, {'capacity': str(e)}
+    
+    return event_data, None
+
 @events_bp.route('', methods=['GET'])
 @optional_auth
 def list_events():
@@ -25,9 +147,11 @@ def list_events():
         city: Filter by city
         category: Filter by category
         search: Search in title/description
+        ids: Comma-separated event UUIDs to fetch (at most MAX_PAGE_SIZE)
     
     Returns:
         200: List of events
+        400: Invalid or too many ids
     """
     try:
         supabase = get_supabase()
@@ -37,48 +161,41 @@ def list_events():
         category = request.args.get('category', '').strip().lower()
         search = request.args.get('search', '').strip()
         
-        # Start query - only active, future events
-        query = supabase.table('events').select('*, profiles!events_organizer_id_fkey(name, email)')
-        query = query.eq('status', 'active')
-        query = query.gte('datetime', datetime.utcnow().isoformat())
-        
-        # Apply filters
-        if city:
-            query = query.ilike('city', f'%{city}%')
+        # Unknown categories are ignored rather than rejected
+        if category not in VALID_CATEGORIES:
+            category = ''
         
-        if category:
-            valid_categories = ['music', 'tech', 'sports', 'food', 'arts', 'business', 'workshop', 'networking', 'entertainment', 'other']
-            if category in valid_categories:
-                query = query.eq('category', category)
+        # Optional id filter: fetch just these events
+        ids = tuple(filter(None, (event_id.strip() for event_id in request.args.get('ids', '').split(','))))
+        if len(ids) > MAX_PAGE_SIZE:
+            return validation_error({'ids': f'At most {MAX_PAGE_SIZE} ids can be requested at once'})
+        uuid_valid, uuid_error = validate_uuids(*ids)
+        if not uuid_valid:
+            return error_response(uuid_error, 400)
         
-        if search:
-            query = query.or_(f'title.ilike.%{search}%,description.ilike.%{search}%')
+        # Anonymous listings carry no per-user RSVP flag, so they can be shared
+        cache_key = (city, category, search, ids)
+        if not g.user:
+            events = _listing_cache.get(cache_key)
+            if events is not None:
+                return ok({'events': events})
         
-        # Order by date (upcoming first)
-        query = query.order('datetime', desc=False)
+        # Active, future events with organizer, RSVP count and the caller's RSVP
+        # status, aggregated server-side in a single query (see schema.sql)
+        response = supabase.rpc('events_with_counts', {
+            'p_user': g.user['id'] if g.user else None,
+            'p_city': city or None,
+            'p_category': category or None,
+            'p_search': search or None,
+            'p_ids': list(ids) or None
+        }).execute()
         
-        # Execute query
-        response = query.execute()
+        events = response.data or []
         
-        # Get RSVP counts for each event
-        events = response.data
-        for event in events:
-            rsvp_response = supabase.table('rsvps').select('id', count='exact').eq('event_id', event['id']).execute()
-            event['rsvp_count'] = rsvp_response.count if rsvp_response.count else 0
-            
-            # Check if current user has RSVP'd
-            if g.user:
-                user_rsvp = supabase.table('rsvps').select('id').eq('event_id', event['id']).eq('user_id', g.user['id']).execute()
-                event['user_has_rsvped'] = len(user_rsvp.data) > 0
-            else:
-                event['user_has_rsvped'] = False
-            
-            # Format organizer data
-            if event.get('profiles'):
-                event['organizer'] = event['profiles']
-                del event['profiles']
+        if not g.user:
+            _listing_cache.set(cache_key, events)
         
-        return success_response(data={'events': events})
+        return ok({'events': events})
         
     except Exception as e:
         return error_response(f'Failed to fetch events: {str(e)}', 500)
@@ -103,43 +220,39 @@ def get_event(event_id):
             return error_response(uuid_error, 400)
         
         supabase = get_supabase()
+        user_id = g.user['id'] if g.user else None
         
-        # Fetch event with organizer info
-        response = supabase.table('events').select('*, profiles!events_organizer_id_fkey(id, name, email, avatar_url)').eq('id', event_id).execute()
+        # Fetch event with organizer info and its RSVP count (aggregated in the
+        # same query), concurrently with the user's RSVP
+        calls = [
+            lambda: supabase.table('events').select(f'*, organizer:profiles!events_organizer_id_fkey(id, name, email, avatar_url), {RSVP_COUNT_SELECT}').eq('id', event_id).execute()
+        ]
+        if user_id:
+            calls.append(lambda: supabase.table('rsvps').select('id').eq('event_id', event_id).eq('user_id', user_id).execute())
         
-        if not response.data or len(response.data) == 0:
+        response, *user_rsvp = run_concurrently(*calls)
+        
+        if not response.data:
             return error_response('Event not found', 404)
         
         event = response.data[0]
         
         # Check if event is active or user is the organizer
         if event['status'] != 'active':
-            if not g.user or g.user['id'] != event['organizer_id']:
+            if not user_id or user_id != event['organizer_id']:
                 return error_response('Event not found', 404)
         
-        # Get RSVP count
-        rsvp_response = supabase.table('rsvps').select('id', count='exact').eq('event_id', event_id).execute()
-        event['rsvp_count'] = rsvp_response.count if rsvp_response.count else 0
+        flatten_rsvp_count(event)
+        event['user_has_rsvped'] = bool(user_rsvp and user_rsvp[0].data)
         
-        # Check if current user has RSVP'd
-        if g.user:
-            user_rsvp = supabase.table('rsvps').select('id').eq('event_id', event_id).eq('user_id', g.user['id']).execute()
-            event['user_has_rsvped'] = len(user_rsvp.data) > 0
-        else:
-            event['user_has_rsvped'] = False
+        return conditional_response(ok(event))
         
-        # Format organizer data
-        if event.get('profiles'):
-            event['organizer'] = event['profiles']
-            del event['profiles']
-        
-        return success_response(data=event)
-        
-    except Exception as e:
-        error_str = str(e)
-        if any(keyword in error_str.lower() for keyword in ['not found', 'no rows', '0 rows']):
+    except APIError as e:
+        if e.code == NO_ROWS:
             return error_response('Event not found', 404)
-        return error_response(f'Failed to fetch event: {error_str}', 500)
+        return error_response(f'Failed to fetch event: {str(e)}', 500)
+    except Exception as e:
+        return error_response(f'Failed to fetch event: {str(e)}', 500)
 
 @events_bp.route('/trending', methods=['GET'])
 def get_trending_events():
@@ -150,26 +263,20 @@ def get_trending_events():
         200: List of trending events
     """
     try:
-        supabase = get_supabase()
-        
-        # Get events marked as trending or with most RSVPs
-        response = supabase.table('events').select('*, profiles!events_organizer_id_fkey(name, email)').eq('status', 'active').gte('datetime', datetime.utcnow().isoformat()).order('is_trending', desc=True).limit(10).execute()
+        events = _listing_cache.get('trending')
+        if events is not None:
+            return ok({'events': events})
         
-        events = response.data
+        supabase = get_supabase()
         
-        # Add RSVP counts
-        for event in events:
-            rsvp_response = supabase.table('rsvps').select('id', count='exact').eq('event_id', event['id']).execute()
-            event['rsvp_count'] = rsvp_response.count if rsvp_response.count else 0
-            
-            if event.get('profiles'):
-                event['organizer'] = event['profiles']
-                del event['profiles']
+        # Events marked as trending or with most RSVPs, ranked and counted
+        # server-side in a single query (see schema.sql)
+        response = supabase.rpc('trending_events', {'p_limit': 10}).execute()
         
-        # Sort by RSVP count
-        events.sort(key=lambda x: x['rsvp_count'], reverse=True)
+        events = response.data or []
+        _listing_cache.set('trending', events, ttl=TRENDING_CACHE_TTL)
         
-        return success_response(data={'events': events[:10]})
+        return ok({'events': events})
         
     except Exception as e:
         return error_response(f'Failed to fetch trending events: {str(e)}', 500)
@@ -209,49 +316,10 @@ def create_event():
         if not data:
             return error_response('Request body is required', 400)
         
-        # Validate required fields
-        required_fields = ['title', 'description', 'datetime', 'location', 'city', 'category']
-        field_errors = validate_required_fields(data, required_fields)
-        
-        if field_errors:
-            return validation_error(field_errors)
-        
-        # Validate event data
-        is_valid, errors = validate_event_data(data)
-        if not is_valid:
+        event_data, errors = _new_event_row(data, g.user['id'])
+        if errors:
             return validation_error(errors)
         
-        # Prepare event data
-        event_data = {
-            'organizer_id': g.user['id'],
-            'title': data['title'].strip(),
-            'description': data['description'].strip(),
-            'datetime': data['datetime'],
-            'location': data['location'].strip(),
-            'city': data['city'].strip(),
-            'category': data['category'].lower().strip(),
-            'status': 'active'
-        }
-        
-        # Add optional fields
-        if data.get('end_datetime'):
-            event_data['end_datetime'] = data['end_datetime']
-        
-        if data.get('address'):
-            event_data['address'] = data['address'].strip()
-        
-        if data.get('image_url'):
-            event_data['image_url'] = data['image_url'].strip()
-        
-        if data.get('capacity'):
-            try:
-                capacity = int(data['capacity'])
-                if capacity < 1:
-                    return validation_error({'capacity': 'Capacity must be at least 1'})
-                event_data['capacity'] = capacity
-            except (ValueError, TypeError):
-                return validation_error({'capacity': 'Capacity must be a valid number'})
-        
         # Create event - USE ADMIN CLIENT to bypass RLS
         supabase = get_supabase_admin()
         response = supabase.table('events').insert(event_data).execute()
@@ -262,6 +330,7 @@ def create_event():
         event = response.data[0]
         event['rsvp_count'] = 0
         event['user_has_rsvped'] = False
+        _listing_cache.clear()
         
         return success_response(
             data=event,
@@ -272,6 +341,78 @@ def create_event():
     except Exception as e:
         return error_response(f'Failed to create event: {str(e)}', 500)
 
+@events_bp.route('/bulk', methods=['POST'])
+@require_auth
+@require_organizer
+def create_events():
+    """
+    Create several events in one request (organizer only)
+    
+    Headers:
+        Authorization: Bearer <jwt_token>
+    
+    Request Body:
+        {
+            "events": [{...}, {...}]  // each shaped like POST /api/events
+        }
+    
+    Returns:
+        201: Events created successfully (in request order)
+        400: Validation error (no events, too many, or an invalid event)
+        403: User is not an organizer
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return error_response('Request body is required', 400)
+        
+        events = data.get('events')
+        
+        if not isinstance(events, list) or not events:
+            return validation_error({'events': 'Events must be a non-empty list'})
+        
+        if len(events) > MAX_BULK_EVENTS:
+            return validation_error({'events': f'At most {MAX_BULK_EVENTS} events can be created at once'})
+        
+        # Validate every event before inserting any of them
+        organizer_id = g.user['id']
+        rows = []
+        for index, event_data in enumerate(events, 1):
+            if not isinstance(event_data, dict):
+                return validation_error({'events': f'Event {index}: Must be an object'})
+            
+            row, errors = _new_event_row(event_data, organizer_id)
+            if errors:
+                return validation_error({'events': f'Event {index}: ' + '; '.join(errors.values())})
+            
+            rows.append(row)
+        
+        # One multi-row INSERT - USE ADMIN CLIENT to bypass RLS
+        supabase = get_supabase_admin()
+        response = supabase.table('events').insert(rows).execute()
+        
+        if not response.data:
+            return error_response('Failed to create events', 500)
+        
+        created = response.data
+        for event in created:
+            event['rsvp_count'] = 0
+            event['user_has_rsvped'] = False
+        _listing_cache.clear()
+        
+        return success_response(
+            data={
+                'events': created,
+                'count': len(created)
+            },
+            message='Events created successfully',
+            status=201
+        )
+        
+    except Exception as e:
+        return error_response(f'Failed to create events: {str(e)}', 500)
+
 @events_bp.route('/<event_id>', methods=['PUT'])
 @require_auth
 @require_organizer
@@ -310,9 +451,9 @@ def update_event(event_id):
         supabase = get_supabase()
         
         # Check if event exists and user is the organizer
-        event_response = supabase.table('events').select('*').eq('id', event_id).execute()
+        event_response = supabase.table('events').select('organizer_id').eq('id', event_id).execute()
         
-        if not event_response.data or len(event_response.data) == 0:
+        if not event_response.data:
             return error_response('Event not found', 404)
         
         event = event_response.data[0]
@@ -323,57 +464,12 @@ def update_event(event_id):
         # Build update data
         update_data = {}
         
-        if 'title' in data:
-            title = data['title'].strip()
-            if len(title) < 3:
-                return validation_error({'title': 'Title must be at least 3 characters'})
-            update_data['title'] = title
-        
-        if 'description' in data:
-            description = data['description'].strip()
-            if len(description) < 10:
-                return validation_error({'description': 'Description must be at least 10 characters'})
-            update_data['description'] = description
-        
-        if 'datetime' in data:
-            update_data['datetime'] = data['datetime']
-        
-        if 'end_datetime' in data:
-            update_data['end_datetime'] = data['end_datetime']
-        
-        if 'location' in data:
-            update_data['location'] = data['location'].strip()
-        
-        if 'city' in data:
-            update_data['city'] = data['city'].strip()
-        
-        if 'address' in data:
-            update_data['address'] = data['address'].strip() if data['address'] else None
-        
-        if 'category' in data:
-            category = data['category'].lower().strip()
-            valid_categories = ['music', 'tech', 'sports', 'food', 'arts', 'business', 'workshop', 'networking', 'entertainment', 'other']
-            if category not in valid_categories:
-                return validation_error({'category': f'Category must be one of: {", ".join(valid_categories)}'})
-            update_data['category'] = category
-        
-        if 'image_url' in data:
-            update_data['image_url'] = data['image_url'].strip() if data['image_url'] else None
-        
-        if 'capacity' in data:
-            try:
-                capacity = int(data['capacity'])
-                if capacity < 1:
-                    return validation_error({'capacity': 'Capacity must be at least 1'})
-                update_data['capacity'] = capacity
-            except (ValueError, TypeError):
-                return validation_error({'capacity': 'Capacity must be a valid number'})
-        
-        if 'status' in data:
-            status = data['status'].lower().strip()
-            if status not in ['active', 'canceled', 'completed']:
-                return validation_error({'status': 'Status must be active, canceled, or completed'})
-            update_data['status'] = status
+        for field, parse in _EVENT_UPDATE_FIELDS.items():
+            if field in data:
+                try:
+                    update_data[field] = parse(data[field])
+                except ValueError as e:
+                    return validation_error({field: str(e)})
         
         if not update_data:
             return error_response('No fields to update', 400)
@@ -385,6 +481,8 @@ def update_event(event_id):
         if not response.data:
             return error_response('Failed to update event', 500)
         
+        _listing_cache.clear()
+        
         return success_response(
             data=response.data[0],
             message='Event updated successfully'
@@ -420,9 +518,9 @@ def delete_event(event_id):
         supabase = get_supabase()
         
         # Check if event exists and user is the organizer
-        event_response = supabase.table('events').select('*').eq('id', event_id).execute()
+        event_response = supabase.table('events').select('organizer_id').eq('id', event_id).execute()
         
-        if not event_response.data or len(event_response.data) == 0:
+        if not event_response.data:
             return error_response('Event not found', 404)
         
         event = event_response.data[0]
@@ -433,6 +531,7 @@ def delete_event(event_id):
         # Soft delete - mark as canceled - USE ADMIN CLIENT to bypass RLS
         supabase_admin = get_supabase_admin()
         supabase_admin.table('events').update({'status': 'canceled'}).eq('id', event_id).execute()
+        _listing_cache.clear()
         
         return success_response(message='Event canceled successfully')
         
@@ -456,7 +555,7 @@ def get_organizer_events():
         supabase = get_supabase()
         
         # Get organizer's events - ALL statuses (active, canceled, completed)
-        query = supabase.table('events').select('*').eq('organizer_id', g.user['id'])
+        query = supabase.table('events').select(f'*, {RSVP_COUNT_SELECT}').eq('organizer_id', g.user['id'])
         query = query.order('created_at', desc=True)
         
         response = query.execute()
@@ -464,10 +563,9 @@ def get_organizer_events():
         
         # Add RSVP counts
         for event in events:
-            rsvp_response = supabase.table('rsvps').select('id', count='exact').eq('event_id', event['id']).execute()
-            event['rsvp_count'] = rsvp_response.count if rsvp_response.count else 0
+            flatten_rsvp_count(event)
         
-        return success_response(data={'events': events})
+        return ok({'events': events})
         
     except Exception as e:
         return error_response(f'Failed to fetch events: {str(e)}', 500)
\ No newline at end of file
@@ -3,17 +3,37 @@ Groups Routes - MVP Version
 Handles community group creation, discovery, and membership
 """
 from flask import Blueprint, request, g
-from app.utils.supabase_client import get_supabase, get_supabase_admin
-from app.utils.responses import success_response, error_response, validation_error
+from app.utils.supabase_client import get_supabase, get_supabase_admin, APIError, UNIQUE_VIOLATION, NO_ROWS
+from app.utils.responses import success_response, ok, error_response, validation_error, conditional_response, streamed_success_response
+from app.utils.concurrency import run_concurrently
 from app.utils.validators import (
-    validate_required_fields,
+    make_required_validator,
     validate_uuid,
     validate_group_data
 )
+from app.utils.pagination import page_limit, encode_cursor, decode_cursor, keyset_filter
+from app.utils.membership import get_member_role, cached_member_count, cache_member_count, invalidate_membership
 from app.middleware.auth import require_auth, optional_auth
 
 groups_bp = Blueprint('groups', __name__)
 
+_validate_group_required = make_required_validator(('name', 'description'))
+
+# Embedded PostgREST aggregate: counts each group's members in the same query
+MEMBER_COUNT_SELECT = 'group_members(count)'
+
+def _flatten_member_count(group):
+    """Replace the embedded group_members(count) aggregate with a flat member_count"""
+    members = group.pop('group_members', None)
+    group['member_count'] = members[0]['count'] if members else 0
+
+def _recount_members(group_id: str) -> int:
+    """Count a group's members after a join or leave and cache the fresh count"""
+    response = get_supabase().table('group_members').select('id', count='exact').eq('group_id', group_id).limit(1).execute()
+    member_count = response.count or 0
+    cache_member_count(group_id, member_count)
+    return member_count
+
 @groups_bp.route('', methods=['GET'])
 @optional_auth
 def list_groups():
@@ -23,9 +43,12 @@ def list_groups():
     Query Parameters:
         category: Filter by category
         search: Search in name/description
+        limit: Number of groups to fetch (default: 50, max: 100)
+        before: Cursor from a previous page's next_cursor
     
     Returns:
         200: List of public groups with member counts
+        400: Invalid pagination cursor
     """
     try:
         supabase = get_supabase()
@@ -33,45 +56,35 @@ def list_groups():
         # Get query parameters
         category = request.args.get('category', '').strip()
         search = request.args.get('search', '').strip()
-        
-        # Start query - only public groups
-        query = supabase.table('groups').select('*, profiles!groups_creator_id_fkey(name, email, avatar_url)')
-        query = query.eq('is_public', True)
-        
-        # Apply filters
-        if category:
-            query = query.eq('category', category.lower())
-        
-        if search:
-            query = query.or_(f'name.ilike.%{search}%,description.ilike.%{search}%')
-        
-        # Order by creation date (newest first)
-        query = query.order('created_at', desc=True)
-        
-        # Execute query
-        response = query.execute()
-        groups = response.data
-        
-        # Get member counts and check if current user is a member
-        for group in groups:
-            member_response = supabase.table('group_members').select('id', count='exact').eq('group_id', group['id']).execute()
-            group['member_count'] = member_response.count if member_response.count else 0
-            
-            # Check if current user is a member
-            if g.user:
-                user_membership = supabase.table('group_members').select('id, role').eq('group_id', group['id']).eq('user_id', g.user['id']).execute()
-                group['user_is_member'] = len(user_membership.data) > 0
-                group['user_role'] = user_membership.data[0]['role'] if user_membership.data else None
-            else:
-                group['user_is_member'] = False
-                group['user_role'] = None
-            
-            # Format creator data
-            if group.get('profiles'):
-                group['creator'] = group['profiles']
-                del group['profiles']
-        
-        return success_response(data={'groups': groups})
+        limit = page_limit()
+        before = request.args.get('before', None)
+        
+        cursor = (None, None)
+        if before:
+            cursor = decode_cursor(before)
+            if not cursor:
+                return error_response('Invalid pagination cursor', 400)
+        
+        # Public groups with creator, member count and the caller's membership,
+        # aggregated server-side in a single query (see schema.sql)
+        response = supabase.rpc('list_public_groups', {
+            'p_user': g.user['id'] if g.user else None,
+            'p_category': category.lower() or None,
+            'p_search': search or None,
+            'p_limit': limit,
+            'p_before_created': cursor[0],
+            'p_before_id': cursor[1]
+        }).execute()
+        
+        groups = response.data or []
+        
+        has_more = len(groups) == limit
+        
+        return ok({
+            'groups': groups,
+            'has_more': has_more,
+            'next_cursor': encode_cursor(groups[-1]['created_at'], groups[-1]['id']) if has_more else None
+        })
         
     except Exception as e:
         return error_response(f'Failed to fetch groups: {str(e)}', 500)
@@ -97,49 +110,52 @@ def get_group(group_id):
         
         supabase = get_supabase()
         
-        # Fetch group with creator info
-        response = supabase.table('groups').select('*, profiles!groups_creator_id_fkey(id, name, email, avatar_url)').eq('id', group_id).execute()
+        user_id = g.user['id'] if g.user else None
+        members = supabase.table('group_members')
+        
+        member_count = cached_member_count(group_id)
         
-        if not response.data or len(response.data) == 0:
+        # Fetch group with creator info, member count (unless cached) and the
+        # user's membership concurrently
+        calls = [
+            lambda: supabase.table('groups').select('*, creator:profiles!groups_creator_id_fkey(id, name, email, avatar_url)').eq('id', group_id).execute()
+        ]
+        if member_count is None:
+            calls.append(lambda: members.select('id', count='estimated').eq('group_id', group_id).limit(1).execute())
+        if user_id:
+            calls.append(lambda: members.select('role').eq('group_id', group_id).eq('user_id', user_id).maybe_single().execute())
+        
+        response, *results = run_concurrently(*calls)
+        member_response = results.pop(0) if member_count is None else None
+        user_membership = results[0] if results else None
+        
+        if not response.data:
             return error_response('Group not found', 404)
         
         group = response.data[0]
+        user_role = user_membership.data['role'] if user_membership and user_membership.data else None
         
-        # Check if group is public or user is a member
-        if not group['is_public']:
-            if not g.user:
-                return error_response('Group not found', 404)
-            
-            # Check if user is a member
-            member_check = supabase.table('group_members').select('id').eq('group_id', group_id).eq('user_id', g.user['id']).execute()
-            if not member_check.data:
-                return error_response('Group not found', 404)
-        
-        # Get member count
-        member_response = supabase.table('group_members').select('id', count='exact').eq('group_id', group_id).execute()
-        group['member_count'] = member_response.count if member_response.count else 0
-        
-        # Check if current user is a member
-        if g.user:
-            user_membership = supabase.table('group_members').select('id, role').eq('group_id', group_id).eq('user_id', g.user['id']).execute()
-            group['user_is_member'] = len(user_membership.data) > 0
-            group['user_role'] = user_membership.data[0]['role'] if user_membership.data else None
-        else:
-            group['user_is_member'] = False
-            group['user_role'] = None
-        
-        # Format creator data
-        if group.get('profiles'):
-            group['creator'] = group['profiles']
-            del group['profiles']
-        
-        return success_response(data=group)
+        # Private groups are only visible to their members
+        if not group['is_public'] and not user_role:
+            return error_response('Group not found', 404)
         
-    except Exception as e:
-        error_str = str(e)
-        if any(keyword in error_str.lower() for keyword in ['not found', 'no rows', '0 rows']):
+        if member_response is not None:
+            member_count = member_response.count or 0
+            cache_member_count(group_id, member_count)
+        
+        group['member_count'] = member_count
+        group['user_is_member'] = user_role is not None
+        group['user_role'] = user_role
+        
+        # Clients revalidating an unchanged group get a bodiless 304
+        return conditional_response(ok(group))
+        
+    except APIError as e:
+        if e.code == NO_ROWS:
             return error_response('Group not found', 404)
-        return error_response(f'Failed to fetch group: {error_str}', 500)
+        return error_response(f'Failed to fetch group: {str(e)}', 500)
+    except Exception as e:
+        return error_response(f'Failed to fetch group: {str(e)}', 500)
 
 @groups_bp.route('', methods=['POST'])
 @require_auth
@@ -170,8 +186,7 @@ def create_group():
             return error_response('Request body is required', 400)
         
         # Validate required fields
-        required_fields = ['name', 'description']
-        field_errors = validate_required_fields(data, required_fields)
+        field_errors = _validate_group_required(data)
         
         if field_errors:
             return validation_error(field_errors)
@@ -233,7 +248,7 @@ def join_group(group_id):
         group_id: Group UUID
     
     Returns:
-        201: Successfully joined group
+        201: Successfully joined group, with its updated member count
         400: Already a member or group is private
         404: Group not found
     """
@@ -244,11 +259,12 @@ def join_group(group_id):
             return error_response(uuid_error, 400)
         
         supabase = get_supabase()
+        user_id = g.user['id']
         
         # Check if group exists and is public
-        group_response = supabase.table('groups').select('*').eq('id', group_id).execute()
+        group_response = supabase.table('groups').select('id, name, is_public').eq('id', group_id).execute()
         
-        if not group_response.data or len(group_response.data) == 0:
+        if not group_response.data:
             return error_response('Group not found', 404)
         
         group = group_response.data[0]
@@ -256,45 +272,49 @@ def join_group(group_id):
         if not group['is_public']:
             return error_response('Cannot join private group', 400)
         
-        # Check if user is already a member
-        existing_member = supabase.table('group_members').select('id').eq('group_id', group_id).eq('user_id', g.user['id']).execute()
-        
-        if existing_member.data and len(existing_member.data) > 0:
-            return error_response('You are already a member of this group', 400)
-        
-        # Add user as member - USE ADMIN CLIENT to bypass RLS
+        # Add user as member - USE ADMIN CLIENT to bypass RLS.
+        # ON CONFLICT DO NOTHING: an existing membership comes back as no rows
         member_data = {
             'group_id': group_id,
-            'user_id': g.user['id'],
+            'user_id': user_id,
             'role': 'member'
         }
         
         supabase_admin = get_supabase_admin()
-        response = supabase_admin.table('group_members').insert(member_data).execute()
+        response = supabase_admin.table('group_members').upsert(
+            member_data,
+            on_conflict='group_id,user_id',
+            ignore_duplicates=True
+        ).execute()
         
         if not response.data:
-            return error_response('Failed to join group', 500)
+            return error_response('You are already a member of this group', 400)
+        
+        invalidate_membership(group_id, user_id)
         
         return success_response(
             data={
                 'membership': response.data[0],
                 'group': {
                     'id': group['id'],
-                    'name': group['name']
+                    'name': group['name'],
+                    'member_count': _recount_members(group_id),
+                    'user_is_member': True,
+                    'user_role': 'member'
                 }
             },
             message='Successfully joined group',
             status=201
         )
         
-    except Exception as e:
-        error_str = str(e)
-        
+    except APIError as e:
         # Handle duplicate membership error
-        if 'unique' in error_str.lower() or 'duplicate' in error_str.lower():
+        if e.code == UNIQUE_VIOLATION:
             return error_response('You are already a member of this group', 400)
         
-        return error_response(f'Failed to join group: {error_str}', 500)
+        return error_response(f'Failed to join group: {str(e)}', 500)
+    except Exception as e:
+        return error_response(f'Failed to join group: {str(e)}', 500)
 
 @groups_bp.route('/<group_id>/leave', methods=['DELETE'])
 @require_auth
@@ -309,7 +329,7 @@ def leave_group(group_id):
         group_id: Group UUID
     
     Returns:
-        200: Successfully left group
+        200: Successfully left group, with its updated member count
         400: Cannot leave (you're the only admin)
         404: Not a member or group not found
     """
@@ -320,27 +340,40 @@ def leave_group(group_id):
             return error_response(uuid_error, 400)
         
         supabase = get_supabase()
+        user_id = g.user['id']
+        members = supabase.table('group_members')
         
         # Check if user is a member
-        membership = supabase.table('group_members').select('id, role').eq('group_id', group_id).eq('user_id', g.user['id']).execute()
+        membership = members.select('role').eq('group_id', group_id).eq('user_id', user_id).maybe_single().execute()
         
-        if not membership.data or len(membership.data) == 0:
+        if not membership or not membership.data:
             return error_response('You are not a member of this group', 404)
         
-        user_role = membership.data[0]['role']
+        user_role = membership.data['role']
         
         # If user is admin, check if they're the only admin
         if user_role == 'admin':
-            admin_count = supabase.table('group_members').select('id', count='exact').eq('group_id', group_id).eq('role', 'admin').execute()
+            admin_count = members.select('id', count='exact').eq('group_id', group_id).eq('role', 'admin').execute()
             
             if admin_count.count == 1:
                 return error_response('Cannot leave group: you are the only admin. Please assign another admin first or delete the group.', 400)
         
         # Remove membership - USE ADMIN CLIENT to bypass RLS
         supabase_admin = get_supabase_admin()
-        supabase_admin.table('group_members').delete().eq('group_id', group_id).eq('user_id', g.user['id']).execute()
+        supabase_admin.table('group_members').delete().eq('group_id', group_id).eq('user_id', user_id).execute()
+        invalidate_membership(group_id, user_id)
         
-        return success_response(message='Successfully left group')
+        return success_response(
+            data={
+                'group': {
+                    'id': group_id,
+                    'member_count': _recount_members(group_id),
+                    'user_is_member': False,
+                    'user_role': None
+                }
+            },
+            message='Successfully left group'
+        )
         
     except Exception as e:
         return error_response(f'Failed to leave group: {str(e)}', 500)
@@ -357,8 +390,13 @@ def get_group_members(group_id):
     URL Parameters:
         group_id: Group UUID
     
+    Query Parameters:
+        limit: Number of members to fetch (default: 50, max: 100)
+        after: Cursor from a previous page's next_cursor
+    
     Returns:
         200: List of group members with their profiles
+        400: Invalid pagination cursor
         403: Not a member of this group
         404: Group not found
     """
@@ -373,43 +411,59 @@ def get_group_members(group_id):
         # Check if group exists
         group_response = supabase.table('groups').select('id, name, is_public').eq('id', group_id).execute()
         
-        if not group_response.data or len(group_response.data) == 0:
+        if not group_response.data:
             return error_response('Group not found', 404)
         
         group = group_response.data[0]
         
         # Check if user is a member (unless group is public)
-        if not group['is_public']:
-            membership = supabase.table('group_members').select('id').eq('group_id', group_id).eq('user_id', g.user['id']).execute()
+        if not group['is_public'] and not get_member_role(group_id, g.user['id']):
+            return error_response('You must be a member to view group members', 403)
+        
+        limit = page_limit()
+        after = request.args.get('after', None)
+        
+        # Fetch members with their profile info, oldest first
+        query = supabase.table('group_members').select('id, role, joined_at, profiles!group_members_user_id_fkey(id, name, email, avatar_url, bio, location)').eq('group_id', group_id)
+        
+        # Keyset pagination on (joined_at, id): strictly newer than the cursor
+        if after:
+            cursor = decode_cursor(after)
+            if not cursor:
+                return error_response('Invalid pagination cursor', 400)
             
-            if not membership.data:
-                return error_response('You must be a member to view group members', 403)
+            query = query.or_(keyset_filter('joined_at', *cursor, desc=False))
         
-        # Fetch all members with their profile info
-        response = supabase.table('group_members').select('*, profiles!group_members_user_id_fkey(id, name, email, avatar_url, bio, location)').eq('group_id', group_id).order('joined_at', desc=False).execute()
+        response = query.order('joined_at', desc=False).order('id', desc=False).limit(limit).execute()
         
         members = response.data
+        has_more = len(members) == limit
+        
+        member_count = cached_member_count(group_id)
+        if member_count is None:
+            member_count = _recount_members(group_id)
+        
+        # Format members lazily; each one is serialized as the body is sent
+        formatted_members = (
+            {
+                'membership_id': member['id'],
+                'role': member['role'],
+                'joined_at': member['joined_at'],
+                'user': member['profiles']
+            }
+            for member in members if member.get('profiles')
+        )
         
-        # Format response
-        formatted_members = []
-        for member in members:
-            if member.get('profiles'):
-                member_data = {
-                    'membership_id': member['id'],
-                    'role': member['role'],
-                    'joined_at': member['joined_at'],
-                    'user': member['profiles']
-                }
-                formatted_members.append(member_data)
-        
-        return success_response(data={
+        return streamed_success_response(data={
             'group': {
                 'id': group['id'],
                 'name': group['name']
             },
-            'members': formatted_members,
-            'total': len(formatted_members)
-        })
+            # The group's full member count, not just this page's
+            'total': member_count,
+            'has_more': has_more,
+            'next_cursor': encode_cursor(members[-1]['joined_at'], members[-1]['id']) if has_more else None
+        }, stream_key='members', items=formatted_members)
         
     except Exception as e:
         return error_response(f'Failed to fetch group members: {str(e)}', 500)
@@ -423,37 +477,51 @@ def get_user_groups():
     Headers:
         Authorization: Bearer <jwt_token>
     
+    Query Parameters:
+        limit: Number of groups to fetch (default: 50, max: 100)
+        before: Cursor from a previous page's next_cursor
+    
     Returns:
         200: List of user's groups
+        400: Invalid pagination cursor
     """
     try:
         supabase = get_supabase()
         
-        # Get user's group memberships with group details
-        response = supabase.table('group_members').select('*, groups!group_members_group_id_fkey(*, profiles!groups_creator_id_fkey(name, email))').eq('user_id', g.user['id']).order('joined_at', desc=True).execute()
+        limit = page_limit()
+        before = request.args.get('before', None)
         
-        memberships = response.data
+        # Get user's group memberships with group details, most recently joined first
+        query = supabase.table('group_members').select(f'id, role, joined_at, groups!group_members_group_id_fkey(*, creator:profiles!groups_creator_id_fkey(name, email), {MEMBER_COUNT_SELECT})').eq('user_id', g.user['id'])
         
-        # Format response
-        groups = []
-        for membership in memberships:
-            if membership.get('groups'):
-                group = membership['groups']
-                group['user_role'] = membership['role']
-                group['joined_at'] = membership['joined_at']
-                
-                # Add creator info
-                if group.get('profiles'):
-                    group['creator'] = group['profiles']
-                    del group['profiles']
-                
-                # Get member count
-                member_count = supabase.table('group_members').select('id', count='exact').eq('group_id', group['id']).execute()
-                group['member_count'] = member_count.count if member_count.count else 0
-                
-                groups.append(group)
-        
-        return success_response(data={'groups': groups})
+        # Keyset pagination on (joined_at, id): strictly older than the cursor
+        if before:
+            cursor = decode_cursor(before)
+            if not cursor:
+                return error_response('Invalid pagination cursor', 400)
+            
+            query = query.or_(keyset_filter('joined_at', *cursor))
+        
+        response = query.order('joined_at', desc=True).order('id', desc=True).limit(limit).execute()
+        
+        memberships = response.data
+        has_more = len(memberships) == limit
+        
+        # Format groups lazily; each one is serialized as the body is sent
+        def format_groups():
+            for membership in memberships:
+                if membership.get('groups'):
+                    group = membership['groups']
+                    group['user_role'] = membership['role']
+                    group['joined_at'] = membership['joined_at']
+                    _flatten_member_count(group)
+                    
+                    yield group
+        
+        return streamed_success_response(data={
+            'has_more': has_more,
+            'next_cursor': encode_cursor(memberships[-1]['joined_at'], memberships[-1]['id']) if has_more else None
+        }, stream_key='groups', items=format_groups())
         
     except Exception as e:
         return error_response(f'Failed to fetch user groups: {str(e)}', 500)
\ No newline at end of file
@@ -3,10 +3,10 @@ Profile Routes
 Handles user profile viewing and updates
 """
 from flask import Blueprint, request, g
-from app.utils.supabase_client import get_supabase
-from app.utils.responses import success_response, error_response, validation_error
-from app.utils.validators import validate_uuid, validate_name, validate_role
-from app.middleware.auth import require_auth
+from app.utils.supabase_client import get_supabase, APIError, NO_ROWS
+from app.utils.responses import success_response, ok, error_response, validation_error
+from app.utils.validators import validate_uuid, validate_name, validate_role, validate_http_url
+from app.middleware.auth import require_auth, invalidate_cached_profile
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -33,22 +33,22 @@ def get_profile(user_id):
         response = supabase.table('profiles').select('*').eq('id', user_id).execute()
         
         # Check if any data returned
-        if not response.data or len(response.data) == 0:
+        if not response.data:
             return error_response('User not found', 404)
         
         # Return first (and only) profile
         profile = response.data[0]
         
-        return success_response(data=profile)
-        
-    except Exception as e:
-        error_str = str(e)
+        return ok(profile)
         
-        # Handle "Cannot coerce" error or other "not found" errors
-        if any(keyword in error_str.lower() for keyword in ['cannot coerce', 'not found', 'no rows', '0 rows', 'pgrst116']):
+    except APIError as e:
+        # PGRST116 is PostgREST's "Cannot coerce the result to a single JSON object"
+        if e.code == NO_ROWS:
             return error_response('User not found', 404)
         
-        return error_response(f'Failed to fetch profile: {error_str}', 500)
+        return error_response(f'Failed to fetch profile: {str(e)}', 500)
+    except Exception as e:
+        return error_response(f'Failed to fetch profile: {str(e)}', 500)
 
 @profile_bp.route('', methods=['PUT'])
 @require_auth
@@ -118,8 +118,8 @@ def update_profile():
             avatar_url = data['avatar_url']
             if avatar_url is not None:
                 avatar_url = avatar_url.strip()
-                # Basic URL validation
-                if not avatar_url.startswith(('http://', 'https://')):
+                # Must be an absolute http(s) URL with a host
+                if not validate_http_url(avatar_url)[0]:
                     return validation_error({'avatar_url': 'Avatar URL must be a valid HTTP/HTTPS URL'})
                 update_data['avatar_url'] = avatar_url
             else:
@@ -136,11 +136,11 @@ def update_profile():
         if not response.data:
             return error_response('Failed to update profile', 500)
         
-        # Fetch updated profile
-        updated_profile = supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+        # The update returns the updated row, so no separate fetch is needed
+        invalidate_cached_profile(user_id)
         
         return success_response(
-            data=updated_profile.data,
+            data=response.data[0],
             message='Profile updated successfully'
         )
         
@@ -190,11 +190,11 @@ def update_role():
         if not response.data:
             return error_response('Failed to update role', 500)
         
-        # Fetch updated profile
-        updated_profile = supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+        # The update returns the updated row, so no separate fetch is needed
+        invalidate_cached_profile(user_id)
         
         return success_response(
-            data=updated_profile.data,
+            data=response.data[0],
             message=f'Role updated to {role}'
         )
         
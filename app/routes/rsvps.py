@@ -3,13 +3,23 @@ RSVP Routes - MVP Version
 Handles event RSVP functionality
 """
 from flask import Blueprint, request, g
-from app.utils.supabase_client import get_supabase, get_supabase_admin
-from app.utils.responses import success_response, error_response
+from app.utils.supabase_client import get_supabase, get_supabase_admin, APIError, UNIQUE_VIOLATION
+from app.utils.responses import success_response, ok, error_response
 from app.utils.validators import validate_uuid
+from app.utils.pagination import page_limit, encode_cursor, decode_cursor, keyset_filter
+from app.utils.rsvp_counts import RSVP_COUNT_SELECT, flatten_rsvp_count
 from app.middleware.auth import require_auth
 
 rsvps_bp = Blueprint('rsvps', __name__)
 
+# create_rsvp error codes -> (message, status)
+_RSVP_ERRORS = {
+    'not_found': ('Event not found', 404),
+    'inactive': ('Cannot RSVP to inactive event', 400),
+    'duplicate': ('You have already RSVP\'d to this event', 400),
+    'full': ('Event is at full capacity', 400)
+}
+
 @rsvps_bp.route('/<event_id>', methods=['POST'])
 @require_auth
 def create_rsvp(event_id):
@@ -23,7 +33,7 @@ def create_rsvp(event_id):
         event_id: Event UUID
     
     Returns:
-        201: RSVP created successfully
+        201: RSVP created successfully, with the event's updated RSVP count
         400: Already RSVP'd or event at capacity
         404: Event not found
     """
@@ -33,66 +43,37 @@ def create_rsvp(event_id):
         if not uuid_valid:
             return error_response(uuid_error, 400)
         
-        supabase = get_supabase()
-        
-        # Check if event exists and is active
-        event_response = supabase.table('events').select('*').eq('id', event_id).execute()
-        
-        if not event_response.data or len(event_response.data) == 0:
-            return error_response('Event not found', 404)
-        
-        event = event_response.data[0]
-        
-        if event['status'] != 'active':
-            return error_response('Cannot RSVP to inactive event', 400)
-        
-        # Check if user already RSVP'd
-        existing_rsvp = supabase.table('rsvps').select('id').eq('event_id', event_id).eq('user_id', g.user['id']).execute()
-        
-        if existing_rsvp.data and len(existing_rsvp.data) > 0:
-            return error_response('You have already RSVP\'d to this event', 400)
-        
-        # Check capacity if set
-        if event.get('capacity'):
-            rsvp_count_response = supabase.table('rsvps').select('id', count='exact').eq('event_id', event_id).execute()
-            current_count = rsvp_count_response.count if rsvp_count_response.count else 0
-            
-            if current_count >= event['capacity']:
-                return error_response('Event is at full capacity', 400)
-        
-        # Create RSVP - USE ADMIN CLIENT to bypass RLS
-        rsvp_data = {
-            'event_id': event_id,
-            'user_id': g.user['id']
-        }
-        
+        # Status, duplicate and capacity checks plus the insert run atomically in
+        # one round trip. USE ADMIN CLIENT: the function trusts p_user
         supabase_admin = get_supabase_admin()
-        response = supabase_admin.table('rsvps').insert(rsvp_data).execute()
+        response = supabase_admin.rpc('create_rsvp', {
+            'p_event': event_id,
+            'p_user': g.user['id']
+        }).execute()
         
-        if not response.data:
+        result = response.data
+        
+        if not result:
             return error_response('Failed to create RSVP', 500)
         
+        error = result.get('error')
+        if error:
+            return error_response(*_RSVP_ERRORS[error])
+        
         return success_response(
-            data={
-                'rsvp': response.data[0],
-                'event': {
-                    'id': event['id'],
-                    'title': event['title'],
-                    'datetime': event['datetime']
-                }
-            },
+            data=result,
             message='RSVP successful',
             status=201
         )
         
-    except Exception as e:
-        error_str = str(e)
-        
-        # Handle duplicate RSVP error
-        if 'unique' in error_str.lower() or 'duplicate' in error_str.lower():
+    except APIError as e:
+        # Handle duplicate RSVP error (a concurrent RSVP that won the race)
+        if e.code == UNIQUE_VIOLATION:
             return error_response('You have already RSVP\'d to this event', 400)
         
-        return error_response(f'Failed to create RSVP: {error_str}', 500)
+        return error_response(f'Failed to create RSVP: {str(e)}', 500)
+    except Exception as e:
+        return error_response(f'Failed to create RSVP: {str(e)}', 500)
 
 @rsvps_bp.route('/<event_id>', methods=['DELETE'])
 @require_auth
@@ -107,7 +88,7 @@ def cancel_rsvp(event_id):
         event_id: Event UUID
     
     Returns:
-        200: RSVP canceled successfully
+        200: RSVP canceled successfully, with the event's updated RSVP count
         404: RSVP not found
     """
     try:
@@ -116,19 +97,29 @@ def cancel_rsvp(event_id):
         if not uuid_valid:
             return error_response(uuid_error, 400)
         
-        supabase = get_supabase()
+        user_id = g.user['id']
         
-        # Check if RSVP exists
-        existing_rsvp = supabase.table('rsvps').select('id').eq('event_id', event_id).eq('user_id', g.user['id']).execute()
+        # Delete RSVP - USE ADMIN CLIENT to bypass RLS.
+        # The delete returns the removed rows, so none means there was no RSVP
+        supabase_admin = get_supabase_admin()
+        deleted = supabase_admin.table('rsvps').delete().eq('event_id', event_id).eq('user_id', user_id).execute()
         
-        if not existing_rsvp.data or len(existing_rsvp.data) == 0:
+        if not deleted.data:
             return error_response('RSVP not found', 404)
         
-        # Delete RSVP - USE ADMIN CLIENT to bypass RLS
-        supabase_admin = get_supabase_admin()
-        supabase_admin.table('rsvps').delete().eq('event_id', event_id).eq('user_id', g.user['id']).execute()
+        supabase = get_supabase()
+        rsvp_response = supabase.table('rsvps').select('id', count='exact').eq('event_id', event_id).limit(1).execute()
         
-        return success_response(message='RSVP canceled successfully')
+        return success_response(
+            data={
+                'event': {
+                    'id': event_id,
+                    'rsvp_count': rsvp_response.count or 0,
+                    'user_has_rsvped': False
+                }
+            },
+            message='RSVP canceled successfully'
+        )
         
     except Exception as e:
         return error_response(f'Failed to cancel RSVP: {str(e)}', 500)
@@ -142,16 +133,35 @@ def get_user_rsvps():
     Headers:
         Authorization: Bearer <jwt_token>
     
+    Query Parameters:
+        limit: Number of events to fetch (default: 50, max: 100)
+        before: Cursor from a previous page's next_cursor
+    
     Returns:
         200: List of RSVP'd events
+        400: Invalid pagination cursor
     """
     try:
         supabase = get_supabase()
         
-        # Get user's RSVPs with event details
-        response = supabase.table('rsvps').select('*, events!rsvps_event_id_fkey(*, profiles!events_organizer_id_fkey(name, email))').eq('user_id', g.user['id']).order('created_at', desc=True).execute()
+        limit = page_limit()
+        before = request.args.get('before', None)
+        
+        # Get user's RSVPs with event details, newest first
+        query = supabase.table('rsvps').select(f'id, created_at, events!rsvps_event_id_fkey(*, organizer:profiles!events_organizer_id_fkey(name, email), {RSVP_COUNT_SELECT})').eq('user_id', g.user['id'])
+        
+        # Keyset pagination on (created_at, id): strictly older than the cursor
+        if before:
+            cursor = decode_cursor(before)
+            if not cursor:
+                return error_response('Invalid pagination cursor', 400)
+            
+            query = query.or_(keyset_filter('created_at', *cursor))
+        
+        response = query.order('created_at', desc=True).order('id', desc=True).limit(limit).execute()
         
         rsvps = response.data
+        has_more = len(rsvps) == limit
         
         # Format response
         events = []
@@ -160,18 +170,16 @@ def get_user_rsvps():
                 event = rsvp['events']
                 event['rsvped_at'] = rsvp['created_at']
                 
-                # Add organizer info
-                if event.get('profiles'):
-                    event['organizer'] = event['profiles']
-                    del event['profiles']
-                
-                # Get RSVP count
-                rsvp_count_response = supabase.table('rsvps').select('id', count='exact').eq('event_id', event['id']).execute()
-                event['rsvp_count'] = rsvp_count_response.count if rsvp_count_response.count else 0
+                # RSVP count comes from the embedded aggregate
+                flatten_rsvp_count(event)
                 
                 events.append(event)
         
-        return success_response(data={'events': events})
+        return ok({
+            'events': events,
+            'has_more': has_more,
+            'next_cursor': encode_cursor(rsvps[-1]['created_at'], rsvps[-1]['id']) if has_more else None
+        })
         
     except Exception as e:
         return error_response(f'Failed to fetch RSVPs: {str(e)}', 500)
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+In-Process TTL Cache
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a time-to-live
+
+    Entries are evicted lazily: expired keys are dropped when read, and the
+    least recently used key is dropped once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value under key for ttl seconds (defaults to the cache TTL)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value (expired or not)"""
+        with self._lock:
+            item = self._data.pop(key, None)
+
+        return item[1] if item is not None else default
+
+    def pop_item(self, key: Hashable) -> Optional[tuple]:
+        """Remove key and return (expires_at, value) if it is still live"""
+        with self._lock:
+            item = self._data.pop(key, None)
+
+        if item is None or item[0] <= time.monotonic():
+            return None
+
+        return item
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class TieredCache:
+    """
+    Two-level cache: a small hot L1 in front of a larger TTL-bounded L2
+
+    New keys are admitted to L2 and promoted to L1 on their next hit, so
+    one-off lookups never displace hot entries. When L1 overflows, its least
+    recently used entry is demoted back to L2 with its remaining TTL.
+    """
+
+    def __init__(self, hot_size: int = 512, maxsize: int = 50_000, ttl: float = 300):
+        self.hot_size = hot_size
+        self.ttl = ttl
+        self._hot = OrderedDict()
+        self._cold = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key from L1, then L2"""
+        now = time.monotonic()
+
+        # Both levels are read and moved under one lock, so a concurrent pop()
+        # can't slip in between the L2 lookup and the promotion to L1
+        with self._lock:
+            item = self._hot.get(key)
+            if item is not None:
+                if item[0] > now:
+                    self._hot.move_to_end(key)
+                    return item[1]
+                del self._hot[key]
+                return default
+
+            item = self._cold.pop_item(key)
+            if item is None:
+                return default
+
+            self._promote(key, item)
+            return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value in L2 (replacing any L1 copy)"""
+        with self._lock:
+            self._hot.pop(key, None)
+            self._cold.set(key, value, ttl=ttl)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key from both levels and return its value"""
+        with self._lock:
+            item = self._hot.pop(key, None)
+            cold_value = self._cold.pop(key, default)
+
+        return item[1] if item is not None else cold_value
+
+    def clear(self):
+        """Remove all entries from both levels"""
+        with self._lock:
+            self._hot.clear()
+            self._cold.clear()
+
+    def _promote(self, key: Hashable, item: tuple):
+        """Move an L2 entry into L1, demoting L1's LRU entry on overflow (caller holds the lock)"""
+        self._hot[key] = item
+        self._hot.move_to_end(key)
+
+        if len(self._hot) > self.hot_size:
+            demoted_key, (expires_at, value) = self._hot.popitem(last=False)
+            remaining = expires_at - time.monotonic()
+            if remaining > 0:
+                self._cold.set(demoted_key, value, ttl=remaining)
+
+    def __len__(self) -> int:
+        return len(self._hot) + len(self._cold)
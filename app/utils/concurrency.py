@@ -0,0 +1,30 @@
+"""
+Concurrent I/O Helpers
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+# Shared pool for overlapping independent Supabase calls within a request
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='supabase-io')
+
+def run_concurrently(*calls: Callable[[], Any]) -> List[Any]:
+    """
+    Run independent blocking calls in parallel and return their results in order
+    
+    The first call runs on the current thread and the rest on a shared pool,
+    so total latency is roughly the slowest call instead of the sum. Calls
+    must not touch Flask's request context (g, request); pass values in.
+    
+    Args:
+        calls: Zero-argument callables (e.g. lambdas wrapping .execute())
+    
+    Returns:
+        List of results, in the same order as calls
+    """
+    if not calls:
+        return []
+    
+    futures = [_executor.submit(call) for call in calls[1:]]
+    first = calls[0]()
+    
+    return [first] + [future.result() for future in futures]
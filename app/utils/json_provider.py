@@ -0,0 +1,34 @@
+"""
+orjson-backed JSON Provider
+"""
+import orjson
+from flask.json.provider import JSONProvider, DefaultJSONProvider
+
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes the same way API responses are"""
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=OPTIONS)
+
+class ORJSONProvider(JSONProvider):
+    """
+    JSON provider that serializes with orjson
+    
+    orjson encodes straight to UTF-8 bytes, so responses skip the
+    str -> bytes round-trip that the stdlib provider pays. Types orjson
+    does not handle natively fall back to Flask's default serializer.
+    
+    Output is always compact with keys in insertion order, debug mode
+    included, so clients must not rely on key order.
+    """
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps_bytes(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumps_bytes(obj)
+        return self._app.response_class(body, mimetype='application/json')
@@ -0,0 +1,50 @@
+"""
+Non-blocking Application Logging
+"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from flask.logging import default_handler
+
+LOG_FORMAT = '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records untouched
+    
+    The stock handler formats the message (and traceback) in the calling
+    thread before enqueueing; the queue here never leaves the process, so
+    all formatting is left to the listener thread.
+    """
+    
+    def prepare(self, record):
+        return record
+
+def configure_logging(app):
+    """
+    Route the app logger through a queue drained by a background thread
+    
+    Request threads only allocate a LogRecord; message formatting,
+    traceback rendering and stderr writes happen on the listener thread.
+    """
+    global _listener, _queue_handler
+    
+    if _listener is None:
+        log_queue = queue.SimpleQueue()
+        
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        
+        _queue_handler = _DeferredQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    
+    app.logger.removeHandler(default_handler)
+    if _queue_handler not in app.logger.handlers:
+        app.logger.addHandler(_queue_handler)
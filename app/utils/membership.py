@@ -0,0 +1,57 @@
+"""
+Group Membership Lookups
+"""
+from typing import Optional
+from app.utils.cache import TTLCache
+from app.utils.supabase_client import get_supabase
+
+# Member roles keyed by (user id, group id). Only memberships are cached, never
+# their absence, so a user who just joined is recognised on the next request.
+# The cache is per process: a leave or role change handled by another worker
+# only drops this worker's entry once MEMBERSHIP_CACHE_TTL runs out, so a user
+# who left can keep reading that group's messages here until then.
+MEMBERSHIP_CACHE_TTL = 300
+_membership_cache = TTLCache(maxsize=10_000, ttl=MEMBERSHIP_CACHE_TTL)
+
+# Member counts keyed by group id, dropped whenever someone joins or leaves
+MEMBER_COUNT_CACHE_TTL = 300
+_member_count_cache = TTLCache(maxsize=10_000, ttl=MEMBER_COUNT_CACHE_TTL)
+
+def get_member_role(group_id: str, user_id: str) -> Optional[str]:
+    """
+    Return the user's role in a group, or None if they are not a member
+
+    Args:
+        group_id: Group UUID
+        user_id: User UUID
+
+    Returns:
+        'admin' or 'member', or None
+    """
+    key = (user_id, group_id)
+    role = _membership_cache.get(key)
+    if role is not None:
+        return role
+
+    supabase = get_supabase()
+    membership = supabase.table('group_members').select('role').eq('group_id', group_id).eq('user_id', user_id).maybe_single().execute()
+
+    if not membership or not membership.data:
+        return None
+
+    role = membership.data['role']
+    _membership_cache.set(key, role)
+    return role
+
+def cached_member_count(group_id: str) -> Optional[int]:
+    """Return a group's cached member count, or None if it isn't cached"""
+    return _member_count_cache.get(group_id)
+
+def cache_member_count(group_id: str, count: int):
+    """Remember a group's member count"""
+    _member_count_cache.set(group_id, count)
+
+def invalidate_membership(group_id: str, user_id: str):
+    """Drop a cached membership and the group's member count (call when a user joins, leaves or changes role)"""
+    _membership_cache.pop((user_id, group_id))
+    _member_count_cache.pop(group_id)
@@ -0,0 +1,63 @@
+"""
+Keyset Pagination Helpers
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from flask import request
+from app.utils.validators import validate_uuid
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+def page_limit() -> int:
+    """Read ?limit= from the request, falling back to the default and capping at the maximum"""
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+
+    if limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+def encode_cursor(timestamp: str, row_id: str) -> str:
+    """Build an opaque keyset cursor from a row's (timestamp, id)"""
+    payload = json.dumps({'created_at': timestamp, 'id': row_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str) -> Optional[tuple]:
+    """Return (timestamp, id) from a cursor, or None if it is malformed"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        timestamp, row_id = payload['created_at'], payload['id']
+    except (ValueError, TypeError, KeyError):
+        return None
+
+    if not isinstance(timestamp, str) or not validate_uuid(row_id)[0]:
+        return None
+
+    # Reject anything that isn't a timestamp before it reaches a filter string
+    try:
+        datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+
+    return timestamp, row_id
+
+def keyset_filter(column: str, timestamp: str, row_id: str, desc: bool = True) -> str:
+    """
+    PostgREST or_() filter selecting rows after a cursor in (column, id) order
+
+    Args:
+        column: Timestamp column the listing is ordered by
+        timestamp: Cursor timestamp
+        row_id: Cursor row id (breaks timestamp ties)
+        desc: True for newest-first listings, False for oldest-first
+
+    Returns:
+        Filter string for query.or_()
+    """
+    op = 'lt' if desc else 'gt'
+    return (
+        f'{column}.{op}."{timestamp}",'
+        f'and({column}.eq."{timestamp}",id.{op}.{row_id})'
+    )
@@ -1,8 +1,35 @@
 """
 Standard API Response Helpers
 """
-from flask import jsonify
-from typing import Any, Optional
+from flask import Response, request
+from typing import Any, Iterable, Optional
+from app.utils.json_provider import dumps_bytes
+
+def _json_response(payload: Any, status: int):
+    """Serialize payload with orjson straight into a (response, status) tuple"""
+    return Response(dumps_bytes(payload), mimetype='application/json'), status
+
+def error_body(error: str, message: str = "") -> bytes:
+    """Serialize a fixed error payload, so callers can build it once and reuse the bytes"""
+    payload = {'success': False, 'error': error}
+    if message:
+        payload['message'] = message
+    return dumps_bytes(payload)
+
+# Bodies for the most frequent detail-free errors, serialized once at import
+_CANNED_ERRORS = {
+    (error, status): error_body(error)
+    for error, status in (
+        ('Authorization header is required', 401),
+        ('Invalid or expired token', 401),
+        ('Request body is required', 400),
+        ('Invalid UUID format', 400),
+        ('Invalid pagination cursor', 400),
+        ('Event not found', 404),
+        ('Group not found', 404),
+        ('User not found', 404)
+    )
+}
 
 def success_response(data: Any = None, message: str = "", status: int = 200):
     """
@@ -26,7 +53,22 @@ def success_response(data: Any = None, message: str = "", status: int = 200):
     if data is not None:
         response['data'] = data
     
-    return jsonify(response), status
+    return _json_response(response, status)
+
+def ok(data: Any):
+    """
+    Create a plain 200 success response carrying data
+    
+    Same body as success_response(data=data) for the common no-message case,
+    without its optional-field branches. data must not be None.
+    
+    Args:
+        data: Response data (dict, list, etc.)
+    
+    Returns:
+        Flask JSON response tuple
+    """
+    return _json_response({'success': True, 'data': data}, 200)
 
 def error_response(error: str, status: int = 400, details: Optional[dict] = None):
     """
@@ -40,6 +82,11 @@ def error_response(error: str, status: int = 400, details: Optional[dict] = None
     Returns:
         Flask JSON response tuple
     """
+    if not details:
+        body = _CANNED_ERRORS.get((error, status))
+        if body is not None:
+            return Response(body, mimetype='application/json'), status
+    
     response = {
         'success': False,
         'error': error
@@ -48,7 +95,7 @@ def error_response(error: str, status: int = 400, details: Optional[dict] = None
     if details:
         response['details'] = details
     
-    return jsonify(response), status
+    return _json_response(response, status)
 
 def validation_error(errors: dict):
     """
@@ -60,8 +107,57 @@ def validation_error(errors: dict):
     Returns:
         Flask JSON response tuple
     """
-    return jsonify({
+    return _json_response({
         'success': False,
         'error': 'Validation failed',
         'validation_errors': errors
-    }), 400
\ No newline at end of file
+    }, 400)
+
+def conditional_response(response: tuple):
+    """
+    Add a content ETag to a response and answer matching If-None-Match with 304
+    
+    Args:
+        response: (response, status) tuple from success_response
+    
+    Returns:
+        Flask response (304 with no body when the client's copy is current)
+    """
+    resp, status = response
+    resp.status_code = status
+    
+    # Per-user data: browsers may keep it but must revalidate every time
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    
+    resp.add_etag()
+    return resp.make_conditional(request)
+
+def streamed_success_response(data: dict, stream_key: str, items: Iterable, status: int = 200):
+    """
+    Create a success response whose largest list is serialized while it is sent
+    
+    The body matches success_response(data={**data, stream_key: list(items)}),
+    but each item is encoded and written one at a time, so the full list and
+    its JSON are never held in memory together.
+    
+    Args:
+        data: Other fields of the response data (serialized up front)
+        stream_key: Key under data for the streamed list
+        items: Iterable of list items (a generator avoids building the list)
+        status: HTTP status code
+    
+    Returns:
+        Flask streaming response tuple
+    """
+    def generate():
+        yield b'{"success":true,"data":{'
+        for key, value in data.items():
+            yield dumps_bytes(key) + b':' + dumps_bytes(value) + b','
+        
+        yield dumps_bytes(stream_key) + b':['
+        for i, item in enumerate(items):
+            yield (b',' if i else b'') + dumps_bytes(item)
+        yield b']}}'
+    
+    return Response(generate(), mimetype='application/json'), status
\ No newline at end of file
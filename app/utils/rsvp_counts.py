@@ -0,0 +1,11 @@
+"""
+RSVP Count Aggregates
+"""
+
+# Embedded PostgREST aggregate: counts each event's RSVPs in the same query
+RSVP_COUNT_SELECT = 'rsvps(count)'
+
+def flatten_rsvp_count(event: dict):
+    """Replace the embedded rsvps(count) aggregate with a flat rsvp_count"""
+    rsvps = event.pop('rsvps', None)
+    event['rsvp_count'] = rsvps[0]['count'] if rsvps else 0
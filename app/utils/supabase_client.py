@@ -1,52 +1,93 @@
 """
 Supabase Client Wrapper - Fixed Version
 """
+import logging
 import os
+import threading
+from functools import lru_cache
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
+from postgrest.exceptions import APIError
 from typing import Optional
+from app.config import Config
+
+# Child of the Flask app logger ('app'), so records go through its queue handler
+logger = logging.getLogger(__name__)
+
+# Seconds before a PostgREST call gives up (clients and their pooled
+# keep-alive connections live for the whole process)
+SUPABASE_TIMEOUT = int(os.getenv('SUPABASE_TIMEOUT', 30))
+
+# Credentials read once at import (importing app.config loads .env first)
+_SUPABASE_URL = Config.SUPABASE_URL
+_SUPABASE_ANON_KEY = Config.SUPABASE_ANON_KEY
+_SUPABASE_SERVICE_KEY = Config.SUPABASE_SERVICE_KEY
+
+# APIError.code values the routes act on (Postgres SQLSTATEs and PostgREST codes)
+UNIQUE_VIOLATION = '23505'
+NO_ROWS = 'PGRST116'
+
+def _create_client(url: str, key: str) -> Client:
+    """Create a Supabase client whose PostgREST session is reused across requests"""
+    return create_client(url, key, options=ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT))
 
 class SupabaseClient:
-    """Singleton Supabase client"""
+    """
+    Singleton Supabase client
+    
+    Instances are created under a lock with double-checked locking, so
+    concurrent first requests build exactly one client while later calls
+    stay lock-free.
+    """
     _instance: Optional[Client] = None
     _service_instance: Optional[Client] = None
+    _lock = threading.Lock()
     
     @classmethod
     def get_client(cls) -> Client:
         """Get or create Supabase client instance"""
-        if cls._instance is None:
-            url = os.getenv('SUPABASE_URL')
-            key = os.getenv('SUPABASE_ANON_KEY')
-            
-            if not url or not key:
-                raise ValueError("Supabase credentials not found in environment")
-            
-            # Create client without proxy parameter
-            cls._instance = create_client(url, key)
-            print("✅ Supabase client initialized")
-        
-        return cls._instance
+        return cls._instance or cls._init_client()
     
     @classmethod
     def get_service_client(cls) -> Client:
         """Get Supabase client with service role key (bypass RLS)"""
-        if cls._service_instance is None:
-            url = os.getenv('SUPABASE_URL')
-            service_key = os.getenv('SUPABASE_SERVICE_KEY')
-            
-            if not url or not service_key:
-                raise ValueError("Supabase service credentials not found")
-            
-            # Create service client without proxy parameter
-            cls._service_instance = create_client(url, service_key)
-            print("✅ Supabase service client initialized")
+        return cls._service_instance or cls._init_service_client()
+    
+    @classmethod
+    def _init_client(cls) -> Client:
+        """Create the anon client (first call only)"""
+        with cls._lock:
+            if cls._instance is None:
+                if not _SUPABASE_URL or not _SUPABASE_ANON_KEY:
+                    raise ValueError("Supabase credentials not found in environment")
+                
+                # Create client without proxy parameter
+                cls._instance = _create_client(_SUPABASE_URL, _SUPABASE_ANON_KEY)
+                logger.info("Supabase client initialized")
+        
+        return cls._instance
+    
+    @classmethod
+    def _init_service_client(cls) -> Client:
+        """Create the service role client (first call only)"""
+        with cls._lock:
+            if cls._service_instance is None:
+                if not _SUPABASE_URL or not _SUPABASE_SERVICE_KEY:
+                    raise ValueError("Supabase service credentials not found")
+                
+                # Create service client without proxy parameter
+                cls._service_instance = _create_client(_SUPABASE_URL, _SUPABASE_SERVICE_KEY)
+                logger.info("Supabase service client initialized")
         
         return cls._service_instance
 
-# Export singleton instance
+# Export singleton instance (memoized so hot paths skip the class lookup)
+@lru_cache(maxsize=1)
 def get_supabase() -> Client:
     """Get Supabase client instance"""
     return SupabaseClient.get_client()
 
+@lru_cache(maxsize=1)
 def get_supabase_admin() -> Client:
     """Get Supabase admin client (service role)"""
     return SupabaseClient.get_service_client()
\ No newline at end of file
@@ -2,15 +2,36 @@
 Input Validation Utilities
 """
 import re
+import string
+from urllib.parse import urlsplit
 from email_validator import validate_email as email_validate, EmailNotValidError
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterable, List, Any
 
-def validate_email(email: str) -> tuple[bool, str]:
+# Cheap email shape check (compiled once) that rejects obvious non-addresses
+# before email-validator runs
+_EMAIL_SHAPE_RE = re.compile(r'[^@\s]{1,64}@[^@\s]{1,255}\.[^@\s]{2,}')
+
+# Phone formatting characters, stripped in one str.translate pass
+_PHONE_FORMATTING_DELETE = str.maketrans('', '', ' \t\n\r\f\v-()+')
+
+# UUID check without a regex: deleting every hex digit must leave exactly the four dashes
+_HEX_DIGITS_DELETE = str.maketrans('', '', '0123456789abcdefABCDEF')
+_HTTP_SCHEMES = frozenset({'http', 'https'})
+
+_ROLE_NAMES = ('attendee', 'organizer')
+_VALID_ROLES = frozenset(_ROLE_NAMES)
+_ROLE_ERROR = f"Role must be one of: {', '.join(_ROLE_NAMES)}"
+
+# Password character classes, tested with C-level set/str operations instead of regex scans
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+
+def validate_email(email: str, strict: bool = False) -> tuple[bool, str]:
     """
     Validate email format
     
     Args:
         email: Email string to validate
+        strict: Also check the domain accepts mail (DNS lookup, can be slow)
     
     Returns:
         Tuple of (is_valid, error_message)
@@ -18,8 +39,11 @@ def validate_email(email: str) -> tuple[bool, str]:
     if not email:
         return False, "Email is required"
     
+    if not _EMAIL_SHAPE_RE.fullmatch(email):
+        return False, "The email address is not valid."
+    
     try:
-        email_validate(email)
+        email_validate(email, check_deliverability=strict)
         return True, ""
     except EmailNotValidError as e:
         return False, str(e)
@@ -45,10 +69,10 @@ def validate_password(password: str) -> tuple[bool, str]:
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
     
-    if not re.search(r'[a-zA-Z]', password):
+    if _ASCII_LETTERS.isdisjoint(password):
         return False, "Password must contain at least one letter"
     
-    if not re.search(r'\d', password):
+    if not any(map(str.isdecimal, password)):
         return False, "Password must contain at least one number"
     
     return True, ""
@@ -84,13 +108,11 @@ def validate_role(role: str) -> tuple[bool, str]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    valid_roles = ['attendee', 'organizer']
-    
     if not role:
         return False, "Role is required"
     
-    if role not in valid_roles:
-        return False, f"Role must be one of: {', '.join(valid_roles)}"
+    if role not in _VALID_ROLES:
+        return False, _ROLE_ERROR
     
     return True, ""
 
@@ -107,16 +129,57 @@ def validate_uuid(uuid_string: str) -> tuple[bool, str]:
     if not uuid_string:
         return False, "UUID is required"
     
-    uuid_pattern = re.compile(
-        r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
-        re.IGNORECASE
-    )
-    
-    if not uuid_pattern.match(uuid_string):
+    # Fixed layout: 36 chars, dashes at 8/13/18/23, hex digits everywhere else
+    if (
+        not isinstance(uuid_string, str)
+        or len(uuid_string) != 36
+        or not uuid_string[8] == uuid_string[13] == uuid_string[18] == uuid_string[23] == '-'
+        or uuid_string.translate(_HEX_DIGITS_DELETE) != '----'
+    ):
         return False, "Invalid UUID format"
     
     return True, ""
 
+def validate_uuids(*uuid_strings: str) -> tuple[bool, str]:
+    """
+    Validate several UUIDs at once, stopping at the first invalid one
+    
+    Args:
+        uuid_strings: UUID strings to validate
+    
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    for uuid_string in uuid_strings:
+        is_valid, error = validate_uuid(uuid_string)
+        if not is_valid:
+            return False, error
+    
+    return True, ""
+
+def validate_http_url(url: str) -> tuple[bool, str]:
+    """
+    Validate an absolute HTTP/HTTPS URL
+    
+    Args:
+        url: URL string to validate
+    
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not url:
+        return False, "URL is required"
+    
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False, "Invalid URL"
+    
+    if parts.scheme not in _HTTP_SCHEMES or not parts.netloc:
+        return False, "URL must be a valid HTTP/HTTPS URL"
+    
+    return True, ""
+
 def validate_phone(phone: str) -> tuple[bool, str]:
     """
     Validate phone number format
@@ -131,7 +194,7 @@ def validate_phone(phone: str) -> tuple[bool, str]:
         return False, "Phone number is required"
     
     # Remove common formatting characters
-    cleaned_phone = re.sub(r'[\s\-\(\)\+]', '', phone)
+    cleaned_phone = phone.translate(_PHONE_FORMATTING_DELETE)
     
     # Check if it contains only digits (after removing formatting)
     if not cleaned_phone.isdigit():
@@ -154,13 +217,63 @@ def validate_required_fields(data: Dict[str, Any], required_fields: List[str]) -
     Returns:
         Dictionary of validation errors (empty if valid)
     """
-    errors = {}
+    return {
+        field: _required_message(field)
+        for field in required_fields
+        if _is_blank(data.get(field))
+    }
+
+def _is_blank(value: Any) -> bool:
+    """True for a missing/None value or a whitespace-only string (other types are never stringified)"""
+    return value is None or (isinstance(value, str) and not value.strip())
+
+def _required_message(field: str) -> str:
+    """Error message for a missing required field"""
+    return f"{field.replace('_', ' ').title()} is required"
+
+def make_required_validator(required_fields: Iterable[str]) -> Callable[[Dict[str, Any]], Dict[str, str]]:
+    """
+    Build a validate_required_fields equivalent for a fixed set of fields
+    
+    The "... is required" messages are formatted once here rather than on
+    every call, so build validators at import time.
     
-    for field in required_fields:
-        if field not in data or data[field] is None or str(data[field]).strip() == '':
-            errors[field] = f"{field.replace('_', ' ').title()} is required"
+    Args:
+        required_fields: Required field names
     
-    return errors
+    Returns:
+        Function taking the data dict and returning its validation errors
+    """
+    messages = {field: _required_message(field) for field in required_fields}
+    
+    def validate(data: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            field: message
+            for field, message in messages.items()
+            if _is_blank(data.get(field))
+        }
+    
+    return validate
+
+def _length_spec(field: str, min_length: int, max_length: int) -> tuple:
+    """Build a (field, min, max, too-short message, too-long message) length rule"""
+    label = field.replace('_', ' ').title()
+    return (
+        field,
+        min_length,
+        max_length,
+        f"{label} must be at least {min_length} characters long",
+        f"{label} must not exceed {max_length} characters"
+    )
+
+_validate_event_required = make_required_validator(('title', 'description', 'datetime', 'location'))
+
+# Event text field length rules, messages formatted once at import
+_EVENT_LENGTH_SPECS = (
+    _length_spec('title', 3, 200),
+    _length_spec('description', 10, 5000),
+    _length_spec('location', 3, 500)
+)
 
 def validate_event_data(data: Dict[str, Any]) -> tuple[bool, Dict[str, str]]:
     """
@@ -172,38 +285,18 @@ def validate_event_data(data: Dict[str, Any]) -> tuple[bool, Dict[str, str]]:
     Returns:
         Tuple of (is_valid, errors_dict)
     """
-    errors = {}
-    
     # Validate required fields - updated to match API expectations
-    required_fields = ['title', 'description', 'datetime', 'location']
-    
-    # Check for required fields (allow empty string check only for string fields)
-    for field in required_fields:
-        if field not in data or data[field] is None:
-            errors[field] = f"{field.replace('_', ' ').title()} is required"
-        elif isinstance(data[field], str) and data[field].strip() == '':
-            errors[field] = f"{field.replace('_', ' ').title()} is required"
-    
-    # Validate title length
-    if 'title' in data and data['title']:
-        if len(data['title']) < 3:
-            errors['title'] = "Title must be at least 3 characters long"
-        elif len(data['title']) > 200:
-            errors['title'] = "Title must not exceed 200 characters"
-    
-    # Validate description length
-    if 'description' in data and data['description']:
-        if len(data['description']) < 10:
-            errors['description'] = "Description must be at least 10 characters long"
-        elif len(data['description']) > 5000:
-            errors['description'] = "Description must not exceed 5000 characters"
-    
-    # Validate location
-    if 'location' in data and data['location']:
-        if len(data['location']) < 3:
-            errors['location'] = "Location must be at least 3 characters long"
-        elif len(data['location']) > 500:
-            errors['location'] = "Location must not exceed 500 characters"
+    errors = _validate_event_required(data)
+    
+    # Validate text field lengths
+    for field, min_length, max_length, too_short, too_long in _EVENT_LENGTH_SPECS:
+        value = data.get(field)
+        if value:
+            length = len(value)
+            if length < min_length:
+                errors[field] = too_short
+            elif length > max_length:
+                errors[field] = too_long
     
     # Validate capacity if provided
     if 'capacity' in data and data['capacity'] is not None:
@@ -0,0 +1,193 @@
+"""
+Shared Test Fixtures
+Caches test users' access tokens in _fixtures.json so later runs can skip signup,
+and holds the session, runner and setup helpers shared by the test scripts
+"""
+import atexit
+import base64
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connect to the loopback address directly so no request waits on resolving "localhost"
+BASE_URL = "http://127.0.0.1:5000/api"
+
+FIXTURES_PATH = Path(__file__).with_name("_fixtures.json")
+
+# Treat tokens this close to expiry as already expired
+EXPIRY_MARGIN = 60
+
+def _load():
+    """Read the fixtures file, or an empty dict if it is missing or unreadable"""
+    try:
+        return orjson.loads(FIXTURES_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+def token_claims(token):
+    """Decode a JWT's payload without verifying it (the signature is left to the server)"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return orjson.loads(base64.urlsafe_b64decode(payload))
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return {}
+
+def token_expired(token):
+    """Check a JWT's exp claim locally"""
+    try:
+        return float(token_claims(token)["exp"]) - EXPIRY_MARGIN <= time.time()
+    except (KeyError, TypeError, ValueError):
+        return True
+
+def cached_token(key):
+    """Return a cached, unexpired token for key, or None"""
+    token = _load().get(key)
+    if token and not token_expired(token):
+        return token
+    return None
+
+def save_tokens(**tokens):
+    """Merge tokens into the fixtures file (None values are skipped)"""
+    data = _load()
+    data.update({key: token for key, token in tokens.items() if token})
+    FIXTURES_PATH.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+def make_session(token=None):
+    """Pooled keep-alive session, authenticated as the given user when a token is passed"""
+    s = requests.Session()
+    # pool_block: when every pooled connection is busy, wait for one rather than
+    # opening a throwaway extra connection (the pool is larger than fetch_all's 8 workers)
+    s.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16, pool_block=True))
+    s.headers["User-Agent"] = "EventSaga-Tests"
+    # Request bodies are pre-serialized with orjson and sent as data=
+    s.headers["Content-Type"] = "application/json"
+    if token:
+        s.headers["Authorization"] = f"Bearer {token}"
+    return s
+
+def pj(response):
+    """Parse a response body with orjson"""
+    return orjson.loads(response.content)
+
+# Set TEST_VERBOSE=1 to pretty-print response bodies (parses and re-serializes them)
+VERBOSE = bool(os.environ.get("TEST_VERBOSE"))
+
+def body_text(response):
+    """A response body for printing: raw and truncated by default, pretty JSON when verbose"""
+    if VERBOSE:
+        try:
+            return orjson.dumps(pj(response), option=orjson.OPT_INDENT_2).decode()
+        except ValueError:
+            pass
+    return response.text[:2000]
+
+# (URL, Authorization) -> (ETag, parsed body) from earlier GETs, revalidated with If-None-Match
+_etag_cache = {}
+
+def cached_get(session, url, headers=None):
+    """
+    GET url, sending the cached ETag so an unchanged resource comes back as a bodiless 304
+    
+    Returns (response, body): body is the parsed JSON, taken from the cache on a
+    304, or None when the request failed
+    """
+    key = (url, (headers or {}).get("Authorization") or session.headers.get("Authorization"))
+    cached = _etag_cache.get(key)
+    if cached:
+        headers = {**(headers or {}), "If-None-Match": cached[0]}
+    
+    response = session.get(url, headers=headers)
+    if response.status_code == 304:
+        return response, cached[1]
+    
+    body = pj(response) if response.status_code == 200 else None
+    etag = response.headers.get("ETag")
+    if etag and body is not None:
+        _etag_cache[key] = (etag, body)
+    return response, body
+
+class TestRunner:
+    """
+    Pass/fail counters, test output and a thread pool for concurrent requests
+    
+    With buffered=True each test's lines are written together when the next
+    test starts; scripts that print() directly pass buffered=False so runner
+    lines and their own output stay in order.
+    """
+    
+    def __init__(self, buffered=True):
+        self.passed = 0
+        self.failed = 0
+        self.executor = ThreadPoolExecutor(max_workers=8)
+        self.buffered = buffered
+        self._buf = []
+        # Still write out a test's buffered lines if the script dies partway through it
+        atexit.register(self.flush)
+    
+    def fetch_all(self, *calls):
+        """Run independent requests concurrently; responses come back in call order"""
+        return list(self.executor.map(lambda call: call(), calls))
+    
+    def log(self, line=""):
+        """Buffer a line of output (or print it straight away when unbuffered)"""
+        self._buf.append(line)
+        if not self.buffered:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered output with a single stdout write"""
+        if self._buf:
+            sys.stdout.write("\n".join(self._buf) + "\n")
+            sys.stdout.flush()
+            self._buf.clear()
+    
+    def print_test(self, name):
+        self.flush()
+        self.log("\n" + "=" * 60)
+        self.log(f"TEST: {name}")
+        self.log("=" * 60)
+    
+    def assert_status(self, response, expected_status, test_name):
+        if response.status_code == expected_status:
+            self.log(f"✅ {test_name} - Status: {response.status_code}")
+            self.passed += 1
+            return True
+        else:
+            self.log(f"❌ {test_name} - Expected {expected_status}, got {response.status_code}")
+            self.log(body_text(response))
+            self.failed += 1
+            return False
+    
+    def print_summary(self):
+        self.flush()
+        self.log("\n" + "=" * 60)
+        self.log("TEST SUMMARY")
+        self.log("=" * 60)
+        self.log(f"✅ Passed: {self.passed}")
+        self.log(f"❌ Failed: {self.failed}")
+        self.log(f"Total: {self.passed + self.failed}")
+        self.log("=" * 60)
+        self.flush()
+
+def reuse_or_signup(session, key, payload):
+    """Reuse the cached token stored under key, signing the user up only when none is cached"""
+    token = cached_token(key)
+    if token:
+        return token, None
+    return None, session.post(f"{BASE_URL}/auth/signup", data=orjson.dumps(payload))
+
+def setup_user(runner, label, result):
+    """Report a setup user's cached token or signup and return the token"""
+    token, response = result
+    if token:
+        runner.log(f"Reusing cached {label} token: {token[:30]}...")
+    elif runner.assert_status(response, 201, f"{label} signup"):
+        token = pj(response)['data']['session']['access_token']
+        runner.log(f"{label} token: {token[:30]}...")
+    return token
@@ -1,3 +1,6 @@
+-- Trigram indexes for substring (ILIKE '%...%') filters
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE profiles (
     id UUID REFERENCES auth.users(id) ON DELETE CASCADE PRIMARY KEY,
     email TEXT UNIQUE NOT NULL,
@@ -63,11 +66,17 @@ CREATE TABLE events (
 );
 
 CREATE INDEX idx_events_city ON events(city);
+CREATE INDEX idx_events_city_trgm ON events USING GIN (city gin_trgm_ops);
 CREATE INDEX idx_events_category ON events(category);
 CREATE INDEX idx_events_datetime ON events(datetime);
 CREATE INDEX idx_events_organizer ON events(organizer_id);
 CREATE INDEX idx_events_status ON events(status);
 CREATE INDEX idx_events_trending ON events(is_trending) WHERE is_trending = TRUE;
+-- Listing predicates: active events from now on, ordered by datetime (optionally by category)
+CREATE INDEX idx_events_active_datetime ON events(datetime) WHERE status = 'active';
+CREATE INDEX idx_events_active_category_datetime ON events(category, datetime) WHERE status = 'active';
+-- Full-text search over title + description (expression must match events_with_counts)
+CREATE INDEX idx_events_search ON events USING GIN (to_tsvector('simple', title || ' ' || description));
 
 CREATE TRIGGER update_events_updated_at
     BEFORE UPDATE ON events
@@ -85,6 +94,8 @@ CREATE TABLE rsvps (
 CREATE INDEX idx_rsvps_event ON rsvps(event_id);
 CREATE INDEX idx_rsvps_user ON rsvps(user_id);
 CREATE INDEX idx_rsvps_created ON rsvps(created_at);
+-- My RSVPs: a user's RSVPs, newest first
+CREATE INDEX idx_rsvps_user_created ON rsvps(user_id, created_at DESC);
 
 CREATE TABLE groups (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -103,6 +114,10 @@ CREATE TABLE groups (
 CREATE INDEX idx_groups_creator ON groups(creator_id);
 CREATE INDEX idx_groups_category ON groups(category);
 CREATE INDEX idx_groups_public ON groups(is_public) WHERE is_public = TRUE;
+-- Public group listing, newest first
+CREATE INDEX idx_groups_public_created ON groups(created_at DESC) WHERE is_public = TRUE;
+-- Full-text search over name + description (expression must match list_public_groups)
+CREATE INDEX idx_groups_search ON groups USING GIN (to_tsvector('simple', name || ' ' || COALESCE(description, '')));
 
 CREATE TRIGGER update_groups_updated_at
     BEFORE UPDATE ON groups
@@ -121,6 +136,9 @@ CREATE TABLE group_members (
 CREATE INDEX idx_group_members_group ON group_members(group_id);
 CREATE INDEX idx_group_members_user ON group_members(user_id);
 CREATE INDEX idx_group_members_role ON group_members(role);
+-- Admin count per group (leave_group) and a user's groups, newest first (my-groups)
+CREATE INDEX idx_group_members_group_admin ON group_members(group_id) WHERE role = 'admin';
+CREATE INDEX idx_group_members_user_joined ON group_members(user_id, joined_at DESC);
 
 CREATE OR REPLACE FUNCTION add_creator_as_admin()
 RETURNS TRIGGER AS $$
@@ -190,6 +208,274 @@ RETURNS BOOLEAN AS $$
     );
 $$ LANGUAGE sql STABLE;
 
+-- Function: Active upcoming events with organizer and RSVP stats (used by GET /api/events)
+-- p_ids restricts the listing to the given events
+DROP FUNCTION IF EXISTS events_with_counts(UUID, TEXT, TEXT, TEXT);
+CREATE OR REPLACE FUNCTION events_with_counts(
+    p_user UUID DEFAULT NULL,
+    p_city TEXT DEFAULT NULL,
+    p_category TEXT DEFAULT NULL,
+    p_search TEXT DEFAULT NULL,
+    p_ids UUID[] DEFAULT NULL
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_agg(
+        to_jsonb(e) || jsonb_build_object(
+            'organizer', jsonb_build_object('name', p.name, 'email', p.email),
+            'rsvp_count', c.rsvp_count,
+            'user_has_rsvped', p_user IS NOT NULL AND EXISTS(
+                SELECT 1 FROM rsvps r
+                WHERE r.event_id = e.id AND r.user_id = p_user
+            )
+        )
+        ORDER BY e.datetime ASC
+    ), '[]'::JSONB)
+    FROM events e
+    LEFT JOIN profiles p ON p.id = e.organizer_id
+    LEFT JOIN LATERAL (
+        SELECT COUNT(*)::INTEGER AS rsvp_count FROM rsvps r WHERE r.event_id = e.id
+    ) c ON TRUE
+    WHERE e.status = 'active'
+      AND e.datetime >= NOW()
+      AND (p_ids IS NULL OR e.id = ANY(p_ids))
+      AND (p_city IS NULL OR e.city ILIKE '%' || p_city || '%')
+      AND (p_category IS NULL OR e.category = p_category)
+      AND (
+          p_search IS NULL
+          -- Indexed full-text match for real queries
+          OR (length(p_search) >= 3
+              AND to_tsvector('simple', e.title || ' ' || e.description) @@ websearch_to_tsquery('simple', p_search))
+          -- Substring match for very short queries, with LIKE wildcards escaped
+          OR (length(p_search) < 3
+              AND (e.title || ' ' || e.description) ILIKE
+                  '%' || replace(replace(replace(p_search, '\', '\\'), '%', '\%'), '_', '\_') || '%')
+      );
+$$ LANGUAGE sql STABLE;
+
+-- Function: Public groups with creator, member count and the caller's membership (used by GET /api/groups)
+-- Newest first, one page at a time: pass the last row's (created_at, id) as p_before_* for the next page
+DROP FUNCTION IF EXISTS list_public_groups(UUID, TEXT, TEXT);
+CREATE OR REPLACE FUNCTION list_public_groups(
+    p_user UUID DEFAULT NULL,
+    p_category TEXT DEFAULT NULL,
+    p_search TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT 50,
+    p_before_created TIMESTAMPTZ DEFAULT NULL,
+    p_before_id UUID DEFAULT NULL
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_agg(t.grp ORDER BY t.created_at DESC, t.id DESC), '[]'::JSONB)
+    FROM (
+        SELECT
+            gr.created_at,
+            gr.id,
+            to_jsonb(gr) || jsonb_build_object(
+                'creator', jsonb_build_object('name', p.name, 'email', p.email, 'avatar_url', p.avatar_url),
+                'member_count', mc.member_count,
+                'user_is_member', me.role IS NOT NULL,
+                'user_role', me.role
+            ) AS grp
+        FROM groups gr
+        LEFT JOIN profiles p ON p.id = gr.creator_id
+        LEFT JOIN LATERAL (
+            SELECT COUNT(*)::INTEGER AS member_count FROM group_members gm WHERE gm.group_id = gr.id
+        ) mc ON TRUE
+        LEFT JOIN group_members me ON me.group_id = gr.id AND me.user_id = p_user
+        WHERE gr.is_public = TRUE
+          AND (p_category IS NULL OR gr.category = p_category)
+          AND (
+              p_search IS NULL
+              -- Indexed full-text match for real queries
+              OR (length(p_search) >= 3
+                  AND to_tsvector('simple', gr.name || ' ' || COALESCE(gr.description, '')) @@ websearch_to_tsquery('simple', p_search))
+              -- Substring match for very short queries, with LIKE wildcards escaped
+              OR (length(p_search) < 3
+                  AND (gr.name || ' ' || COALESCE(gr.description, '')) ILIKE
+                      '%' || replace(replace(replace(p_search, '\', '\\'), '%', '\%'), '_', '\_') || '%')
+          )
+          -- Keyset cursor: strictly after the previous page's last row
+          AND (p_before_created IS NULL OR (gr.created_at, gr.id) < (p_before_created, p_before_id))
+        ORDER BY gr.created_at DESC, gr.id DESC
+        LIMIT p_limit
+    ) t;
+$$ LANGUAGE sql STABLE;
+
+-- Function: Top upcoming events, trending flag first then most RSVPs (used by GET /api/events/trending)
+CREATE OR REPLACE FUNCTION trending_events(p_limit INTEGER DEFAULT 10)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_agg(t.event ORDER BY t.rsvp_count DESC), '[]'::JSONB)
+    FROM (
+        SELECT
+            to_jsonb(e) || jsonb_build_object(
+                'organizer', jsonb_build_object('name', p.name, 'email', p.email),
+                'rsvp_count', c.rsvp_count
+            ) AS event,
+            c.rsvp_count
+        FROM events e
+        LEFT JOIN profiles p ON p.id = e.organizer_id
+        LEFT JOIN LATERAL (
+            SELECT COUNT(*)::INTEGER AS rsvp_count FROM rsvps r WHERE r.event_id = e.id
+        ) c ON TRUE
+        WHERE e.status = 'active'
+          AND e.datetime >= NOW()
+        ORDER BY e.is_trending DESC, c.rsvp_count DESC, e.datetime ASC
+        LIMIT p_limit
+    ) t;
+$$ LANGUAGE sql STABLE;
+
+-- Function: RSVP a user to an event, enforcing status, duplicates and capacity atomically (used by POST /api/rsvps/<id>)
+-- Returns {"rsvp": ..., "event": ...} or {"error": "not_found" | "inactive" | "duplicate" | "full"}
+CREATE OR REPLACE FUNCTION create_rsvp(p_event UUID, p_user UUID)
+RETURNS JSONB AS $$
+DECLARE
+    v_event events%ROWTYPE;
+    v_rsvp rsvps%ROWTYPE;
+BEGIN
+    -- Lock the event so concurrent RSVPs can't both take the last seat
+    SELECT * INTO v_event FROM events WHERE id = p_event FOR UPDATE;
+    
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('error', 'not_found');
+    END IF;
+    
+    IF v_event.status <> 'active' THEN
+        RETURN jsonb_build_object('error', 'inactive');
+    END IF;
+    
+    IF EXISTS(SELECT 1 FROM rsvps WHERE event_id = p_event AND user_id = p_user) THEN
+        RETURN jsonb_build_object('error', 'duplicate');
+    END IF;
+    
+    IF v_event.capacity IS NOT NULL
+       AND (SELECT COUNT(*) FROM rsvps WHERE event_id = p_event) >= v_event.capacity THEN
+        RETURN jsonb_build_object('error', 'full');
+    END IF;
+    
+    INSERT INTO rsvps (event_id, user_id)
+    VALUES (p_event, p_user)
+    ON CONFLICT ON CONSTRAINT unique_rsvp DO NOTHING
+    RETURNING * INTO v_rsvp;
+    
+    IF v_rsvp.id IS NULL THEN
+        RETURN jsonb_build_object('error', 'duplicate');
+    END IF;
+    
+    -- Return the event's updated RSVP state so callers needn't re-fetch it
+    RETURN jsonb_build_object(
+        'rsvp', to_jsonb(v_rsvp),
+        'event', jsonb_build_object(
+            'id', v_event.id,
+            'title', v_event.title,
+            'datetime', v_event.datetime,
+            'rsvp_count', (SELECT COUNT(*) FROM rsvps WHERE event_id = p_event),
+            'user_has_rsvped', TRUE
+        )
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- p_user is trusted, so only the backend's service role may call create_rsvp
+REVOKE EXECUTE ON FUNCTION create_rsvp(UUID, UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION create_rsvp(UUID, UUID) TO service_role;
+
+-- Function: Post a message as a group member and return it with its sender (used by POST /api/groups/<id>/messages)
+-- Returns NULL when the user is not a member of the group
+CREATE OR REPLACE FUNCTION send_message(p_group UUID, p_user UUID, p_content TEXT)
+RETURNS JSONB AS $$
+DECLARE
+    v_message messages%ROWTYPE;
+BEGIN
+    IF NOT is_group_member(p_group, p_user) THEN
+        RETURN NULL;
+    END IF;
+    
+    INSERT INTO messages (group_id, user_id, content)
+    VALUES (p_group, p_user, p_content)
+    RETURNING * INTO v_message;
+    
+    RETURN jsonb_build_object(
+        'id', v_message.id,
+        'content', v_message.content,
+        'created_at', v_message.created_at,
+        'sender', (
+            SELECT jsonb_build_object('id', p.id, 'name', p.name, 'avatar_url', p.avatar_url)
+            FROM profiles p WHERE p.id = p_user
+        )
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- p_user is trusted, so only the backend's service role may call send_message
+REVOKE EXECUTE ON FUNCTION send_message(UUID, UUID, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION send_message(UUID, UUID, TEXT) TO service_role;
+
+-- Function: Insert several messages from one member in a single statement (used by POST /api/groups/<id>/messages/bulk)
+-- Returns the messages in send order, or NULL if the user is not a member
+CREATE OR REPLACE FUNCTION send_messages(p_group UUID, p_user UUID, p_contents TEXT[])
+RETURNS JSONB AS $$
+DECLARE
+    v_sender JSONB;
+    v_messages JSONB;
+BEGIN
+    IF NOT is_group_member(p_group, p_user) THEN
+        RETURN NULL;
+    END IF;
+    
+    SELECT jsonb_build_object('id', p.id, 'name', p.name, 'avatar_url', p.avatar_url)
+    INTO v_sender
+    FROM profiles p WHERE p.id = p_user;
+    
+    -- One multi-row INSERT; microsecond offsets keep send order stable in (created_at, id) pagination
+    WITH inserted AS (
+        INSERT INTO messages (group_id, user_id, content, created_at)
+        SELECT p_group, p_user, c.content, NOW() + c.ord * INTERVAL '1 microsecond'
+        FROM unnest(p_contents) WITH ORDINALITY AS c(content, ord)
+        RETURNING id, content, created_at
+    )
+    SELECT COALESCE(jsonb_agg(
+        jsonb_build_object('id', i.id, 'content', i.content, 'created_at', i.created_at, 'sender', v_sender)
+        ORDER BY i.created_at
+    ), '[]'::JSONB)
+    INTO v_messages
+    FROM inserted i;
+    
+    RETURN v_messages;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- p_user is trusted, so only the backend's service role may call send_messages
+REVOKE EXECUTE ON FUNCTION send_messages(UUID, UUID, TEXT[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION send_messages(UUID, UUID, TEXT[]) TO service_role;
+
+-- Function: Soft-delete a message if the user sent it or is a group admin (used by DELETE /api/groups/<id>/messages/<id>)
+-- Returns 'deleted', 'forbidden' or 'not_found'
+CREATE OR REPLACE FUNCTION delete_message(p_message UUID, p_group UUID, p_user UUID)
+RETURNS TEXT AS $$
+DECLARE
+    v_sender UUID;
+BEGIN
+    SELECT user_id INTO v_sender
+    FROM messages
+    WHERE id = p_message AND group_id = p_group
+    FOR UPDATE;
+    
+    IF NOT FOUND THEN
+        RETURN 'not_found';
+    END IF;
+    
+    IF v_sender <> p_user AND NOT is_group_admin(p_group, p_user) THEN
+        RETURN 'forbidden';
+    END IF;
+    
+    UPDATE messages SET is_deleted = TRUE WHERE id = p_message;
+    RETURN 'deleted';
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- p_user is trusted, so only the backend's service role may call delete_message
+REVOKE EXECUTE ON FUNCTION delete_message(UUID, UUID, UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION delete_message(UUID, UUID, UUID) TO service_role;
+
 -- Enable RLS on all tables
 ALTER TABLE profiles ENABLE ROW LEVEL SECURITY;
 ALTER TABLE events ENABLE ROW LEVEL SECURITY;
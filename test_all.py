@@ -2,15 +2,31 @@
 EventSaga Backend - Complete Test Suite
 Tests all phases: Auth, Profile, Events, RSVPs, Groups, and Messaging
 """
-import requests
-import json
+import orjson
+import sys
 import time
 from datetime import datetime, timedelta
-
-BASE_URL = "http://localhost:5000/api"
-
-class TestRunner:
+from fixtures import BASE_URL, TestRunner, make_session, pj
+
+# Fixed endpoints and the per-run unique suffix, built once
+HEALTH_URL = f"{BASE_URL}/health"
+SIGNUP_URL = f"{BASE_URL}/auth/signup"
+LOGIN_URL = f"{BASE_URL}/auth/login"
+LOGOUT_URL = f"{BASE_URL}/auth/logout"
+ME_URL = f"{BASE_URL}/auth/me"
+PROFILE_URL = f"{BASE_URL}/profile"
+ROLE_URL = f"{BASE_URL}/profile/role"
+EVENTS_URL = f"{BASE_URL}/events"
+GROUPS_URL = f"{BASE_URL}/groups"
+RUN_TS = int(time.time())
+
+# Anonymous requests share one session; each test user gets their own
+session = make_session()
+
+class SuiteTestRunner(TestRunner):
     def __init__(self):
+        # The tests print() their own output, so runner lines aren't buffered
+        super().__init__(buffered=False)
         self.token = None
         self.user_id = None
         self.organizer_token = None
@@ -18,38 +34,8 @@ class TestRunner:
         self.event_id = None
         self.group_id = None
         self.message_id = None
-        self.passed = 0
-        self.failed = 0
-    
-    def print_test(self, name):
-        print("\n" + "=" * 60)
-        print(f"TEST: {name}")
-        print("=" * 60)
-    
-    def assert_status(self, response, expected_status, test_name):
-        if response.status_code == expected_status:
-            print(f"✅ {test_name} - Status: {response.status_code}")
-            self.passed += 1
-            return True
-        else:
-            print(f"❌ {test_name} - Expected {expected_status}, got {response.status_code}")
-            try:
-                print(json.dumps(response.json(), indent=2))
-            except:
-                print(response.text)
-            self.failed += 1
-            return False
-    
-    def print_summary(self):
-        print("\n" + "=" * 60)
-        print("TEST SUMMARY")
-        print("=" * 60)
-        print(f"✅ Passed: {self.passed}")
-        print(f"❌ Failed: {self.failed}")
-        print(f"Total: {self.passed + self.failed}")
-        print("=" * 60)
-
-runner = TestRunner()
+
+runner = SuiteTestRunner()
 
 print("=" * 60)
 print("EVENTSAGA BACKEND - COMPLETE TEST SUITE")
@@ -64,55 +50,55 @@ print("\n" + "🔐 PHASE 1: AUTHENTICATION & PROFILE TESTS" + "\n")
 
 # Test 1: Health Check
 runner.print_test("Health Check")
-response = requests.get(f"http://localhost:5000/api/health")
+response = session.get(HEALTH_URL)
 runner.assert_status(response, 200, "Health endpoint")
 
 # Test 2: Signup with validation errors
 runner.print_test("Signup Validation - Missing Fields")
-response = requests.post(f"{BASE_URL}/auth/signup", json={})
+response = session.post(SIGNUP_URL, data=orjson.dumps({}))
 runner.assert_status(response, 400, "Should reject empty signup")
 
 # Test 3: Signup with invalid email
 runner.print_test("Signup Validation - Invalid Email")
-response = requests.post(f"{BASE_URL}/auth/signup", json={
+response = session.post(SIGNUP_URL, data=orjson.dumps({
     "email": "invalid-email",
     "password": "Test123!",
     "name": "Test",
     "role": "attendee"
-})
+}))
 runner.assert_status(response, 400, "Should reject invalid email")
 
 # Test 4: Valid Signup (Attendee)
 runner.print_test("Valid Signup - Attendee")
-timestamp = int(time.time())
-attendee_email = f"attendee{timestamp}@gmail.com"
+attendee_email = f"attendee{RUN_TS}@gmail.com"
 signup_data = {
     "email": attendee_email,
     "password": "Attendee123!",
     "name": "Test Attendee",
     "role": "attendee"
 }
-response = requests.post(f"{BASE_URL}/auth/signup", json=signup_data)
+response = session.post(SIGNUP_URL, data=orjson.dumps(signup_data))
 if runner.assert_status(response, 201, "Attendee signup"):
-    runner.token = response.json()['data']['session']['access_token']
-    runner.user_id = response.json()['data']['user']['id']
+    body = pj(response)
+    runner.token = body['data']['session']['access_token']
+    runner.user_id = body['data']['user']['id']
     print(f"Token: {runner.token[:30]}...")
     print(f"User ID: {runner.user_id}")
 
 # Test 5: Valid Login
 runner.print_test("Valid Login")
-response = requests.post(f"{BASE_URL}/auth/login", json={
+response = session.post(LOGIN_URL, data=orjson.dumps({
     "email": attendee_email,
     "password": "Attendee123!"
-})
+}))
 if runner.assert_status(response, 200, "Login successful"):
-    runner.token = response.json()['data']['session']['access_token']
+    runner.token = pj(response)['data']['session']['access_token']
 
-headers = {"Authorization": f"Bearer {runner.token}"}
+user1_session = make_session(runner.token)
 
 # Test 6: Get Current User
 runner.print_test("Get Current User - Protected Route")
-response = requests.get(f"{BASE_URL}/auth/me", headers=headers)
+response = user1_session.get(ME_URL)
 runner.assert_status(response, 200, "Should return user data")
 
 # Test 7: Update Profile
@@ -122,14 +108,12 @@ update_data = {
     "bio": "I love events!",
     "location": "Karachi, Pakistan"
 }
-response = requests.put(f"{BASE_URL}/profile", json=update_data, headers=headers)
+response = user1_session.put(PROFILE_URL, data=orjson.dumps(update_data))
 runner.assert_status(response, 200, "Profile update")
 
 # Test 8: Switch Role to Organizer
 runner.print_test("Switch Role to Organizer")
-response = requests.patch(f"{BASE_URL}/profile/role", 
-                         json={"role": "organizer"}, 
-                         headers=headers)
+response = user1_session.patch(ROLE_URL, data=orjson.dumps({"role": "organizer"}))
 runner.assert_status(response, 200, "Role update")
 
 # ============================================================================
@@ -150,48 +134,52 @@ event_data = {
     "category": "tech",
     "capacity": 100
 }
-response = requests.post(f"{BASE_URL}/events", json=event_data, headers=headers)
+response = user1_session.post(EVENTS_URL, data=orjson.dumps(event_data))
 if runner.assert_status(response, 201, "Event creation"):
-    runner.event_id = response.json()['data']['id']
+    runner.event_id = pj(response)['data']['id']
     print(f"Created event ID: {runner.event_id}")
 
+# Tests 10-11 only read the event created above, so fetch them concurrently
+list_response, detail_response = runner.fetch_all(
+    lambda: session.get(EVENTS_URL),
+    lambda: session.get(f"{BASE_URL}/events/{runner.event_id}")
+)
+
 # Test 10: List All Events
 runner.print_test("List All Events")
-response = requests.get(f"{BASE_URL}/events")
-runner.assert_status(response, 200, "List events")
+runner.assert_status(list_response, 200, "List events")
 
 # Test 11: Get Event Details
 runner.print_test("Get Event Details")
-response = requests.get(f"{BASE_URL}/events/{runner.event_id}")
-runner.assert_status(response, 200, "Get event details")
+runner.assert_status(detail_response, 200, "Get event details")
 
 # Test 12: Create Second User for RSVP Tests
 runner.print_test("Create Second User")
-user2_email = f"user2_{timestamp}@gmail.com"
-response = requests.post(f"{BASE_URL}/auth/signup", json={
+user2_email = f"user2_{RUN_TS}@gmail.com"
+response = session.post(SIGNUP_URL, data=orjson.dumps({
     "email": user2_email,
     "password": "User123!",
     "name": "Test User 2",
     "role": "attendee"
-})
+}))
 if runner.assert_status(response, 201, "User 2 signup"):
-    runner.user2_token = response.json()['data']['session']['access_token']
+    runner.user2_token = pj(response)['data']['session']['access_token']
 
-user2_headers = {"Authorization": f"Bearer {runner.user2_token}"}
+user2_session = make_session(runner.user2_token)
 
 # Test 13: RSVP to Event
 runner.print_test("RSVP to Event")
-response = requests.post(f"{BASE_URL}/rsvps/{runner.event_id}", headers=user2_headers)
+response = user2_session.post(f"{BASE_URL}/rsvps/{runner.event_id}")
 runner.assert_status(response, 201, "RSVP creation")
 
 # Test 14: Get User's RSVPs
 runner.print_test("Get User's RSVPs")
-response = requests.get(f"{BASE_URL}/rsvps/my-rsvps", headers=user2_headers)
+response = user2_session.get(f"{BASE_URL}/rsvps/my-rsvps")
 runner.assert_status(response, 200, "Get my RSVPs")
 
 # Test 15: Cancel RSVP
 runner.print_test("Cancel RSVP")
-response = requests.delete(f"{BASE_URL}/rsvps/{runner.event_id}", headers=user2_headers)
+response = user2_session.delete(f"{BASE_URL}/rsvps/{runner.event_id}")
 runner.assert_status(response, 200, "Cancel RSVP")
 
 # ============================================================================
@@ -208,44 +196,56 @@ group_data = {
     "category": "tech",
     "is_public": True
 }
-response = requests.post(f"{BASE_URL}/groups", json=group_data, headers=headers)
+response = user1_session.post(GROUPS_URL, data=orjson.dumps(group_data))
 if runner.assert_status(response, 201, "Group creation"):
-    runner.group_id = response.json()['data']['id']
+    group = pj(response)['data']
+    runner.group_id = group['id']
     print(f"Created group ID: {runner.group_id}")
-    group = response.json()['data']
     if group['member_count'] == 1 and group['user_is_member'] and group['user_role'] == 'admin':
         print("✅ Creator automatically added as admin")
         runner.passed += 1
 
+# The group's URLs are fixed from here on
+group_url = f"{GROUPS_URL}/{runner.group_id}"
+messages_url = f"{group_url}/messages"
+
+# Tests 17-18 only read the group created above, so fetch them concurrently
+list_response, detail_response = runner.fetch_all(
+    lambda: session.get(GROUPS_URL),
+    lambda: session.get(group_url)
+)
+
 # Test 17: List All Groups
 runner.print_test("List All Groups")
-response = requests.get(f"{BASE_URL}/groups")
-runner.assert_status(response, 200, "List groups")
+runner.assert_status(list_response, 200, "List groups")
 
 # Test 18: Get Group Details
 runner.print_test("Get Group Details")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}")
-runner.assert_status(response, 200, "Get group details")
+runner.assert_status(detail_response, 200, "Get group details")
 
 # Test 19: User 2 Joins Group
 runner.print_test("Join Group - User 2")
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/join", headers=user2_headers)
+response = user2_session.post(f"{group_url}/join")
 runner.assert_status(response, 201, "Join group")
 
+# Tests 20-21 are read-only once user 2 has joined, so fetch them concurrently
+members_response, my_groups_response = runner.fetch_all(
+    lambda: user1_session.get(f"{group_url}/members"),
+    lambda: user1_session.get(f"{BASE_URL}/groups/my-groups")
+)
+
 # Test 20: Get Group Members
 runner.print_test("Get Group Members")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/members", headers=headers)
-if runner.assert_status(response, 200, "Get members"):
-    members = response.json()['data']['members']
+if runner.assert_status(members_response, 200, "Get members"):
+    members = pj(members_response)['data']['members']
     if len(members) == 2:
         print(f"✅ Found {len(members)} members")
         runner.passed += 1
 
 # Test 21: Get User's Groups
 runner.print_test("Get User's Groups")
-response = requests.get(f"{BASE_URL}/groups/my-groups", headers=headers)
-if runner.assert_status(response, 200, "Get my groups"):
-    groups = response.json()['data']['groups']
+if runner.assert_status(my_groups_response, 200, "Get my groups"):
+    groups = pj(my_groups_response)['data']['groups']
     if len(groups) > 0:
         print(f"✅ User is in {len(groups)} group(s)")
         runner.passed += 1
@@ -258,9 +258,9 @@ print("\n" + "PHASE 4: REAL-TIME MESSAGING TESTS" + "\n")
 
 # Test 22: Get Messages (Empty at First)
 runner.print_test("Get Messages - Empty Group")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=headers)
+response = user1_session.get(messages_url)
 if runner.assert_status(response, 200, "Get messages"):
-    messages = response.json()['data']['messages']
+    messages = pj(response)['data']['messages']
     if len(messages) == 0:
         print("✅ No messages in new group")
         runner.passed += 1
@@ -268,54 +268,47 @@ if runner.assert_status(response, 200, "Get messages"):
 # Test 23: Send Message - User 1
 runner.print_test("Send Message - User 1")
 message_data = {"content": "Hello everyone! Welcome to the group."}
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json=message_data, 
-                        headers=headers)
+response = user1_session.post(messages_url, data=orjson.dumps(message_data))
 if runner.assert_status(response, 201, "Message sent"):
-    runner.message_id = response.json()['data']['id']
+    runner.message_id = pj(response)['data']['id']
     print(f"Message ID: {runner.message_id}")
 
 # Test 24: Send Message - User 2
 runner.print_test("Send Message - User 2")
 message_data = {"content": "Thanks for creating this group!"}
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json=message_data, 
-                        headers=user2_headers)
+response = user2_session.post(messages_url, data=orjson.dumps(message_data))
 runner.assert_status(response, 201, "Message sent")
 
 # Test 25: Send Another Message - User 1
 runner.print_test("Send Message - User 1 Again")
 message_data = {"content": "Let's discuss some interesting tech topics!"}
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json=message_data, 
-                        headers=headers)
+response = user1_session.post(messages_url, data=orjson.dumps(message_data))
 runner.assert_status(response, 201, "Message sent")
 
 # Test 26: Get All Messages
 runner.print_test("Get All Messages")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=headers)
+response = user1_session.get(messages_url)
 if runner.assert_status(response, 200, "Get messages"):
-    data = response.json()['data']
+    data = pj(response)['data']
     messages = data['messages']
     if len(messages) == 3:
         print(f"✅ Found {len(messages)} messages")
         runner.passed += 1
         print(f"\nMessages in chronological order:")
-        for i, msg in enumerate(messages, 1):
-            print(f"{i}. [{msg['sender']['name']}]: {msg['content'][:50]}...")
+        sys.stdout.write("".join(
+            f"{i}. [{msg['sender']['name']}]: {msg['content'][:50]}...\n"
+            for i, msg in enumerate(messages, 1)
+        ))
 
 # Test 28: Delete Own Message
 runner.print_test("Delete Message - Owner")
-response = requests.delete(f"{BASE_URL}/groups/{runner.group_id}/messages/{runner.message_id}", 
-                          headers=headers)
+response = user1_session.delete(f"{messages_url}/{runner.message_id}")
 runner.assert_status(response, 200, "Delete own message")
 
 # Test 30: Send Message with Special Characters
 runner.print_test("Send Message with Special Characters")
 message_data = {"content": "Testing emojis 🎉🚀 and symbols @#$%^&*()"}
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json=message_data, 
-                        headers=headers)
+response = user1_session.post(messages_url, data=orjson.dumps(message_data))
 runner.assert_status(response, 201, "Message with special chars")
 
 # ============================================================================
@@ -326,23 +319,23 @@ print("\n" + "🧹 CLEANUP & FINAL TESTS" + "\n")
 
 # Test 31: User 2 Leaves Group
 runner.print_test("Leave Group - User 2")
-response = requests.delete(f"{BASE_URL}/groups/{runner.group_id}/leave", headers=user2_headers)
+response = user2_session.delete(f"{group_url}/leave")
 runner.assert_status(response, 200, "Leave group")
 
 # Test 32: Update Event
 runner.print_test("Update Event")
 update_data = {"title": "Updated Tech Conference 2025", "capacity": 150}
-response = requests.put(f"{BASE_URL}/events/{runner.event_id}", json=update_data, headers=headers)
+response = user1_session.put(f"{BASE_URL}/events/{runner.event_id}", data=orjson.dumps(update_data))
 runner.assert_status(response, 200, "Event update")
 
 # Test 33: Get Organizer's Events
 runner.print_test("Get Organizer's Events")
-response = requests.get(f"{BASE_URL}/events/organizer/my-events", headers=headers)
+response = user1_session.get(f"{BASE_URL}/events/organizer/my-events")
 runner.assert_status(response, 200, "Get my events")
 
 # Test 34: Logout
 runner.print_test("Logout")
-response = requests.post(f"{BASE_URL}/auth/logout", headers=headers)
+response = user1_session.post(LOGOUT_URL)
 runner.assert_status(response, 200, "Logout")
 
 # ============================================================================
@@ -1,24 +1,41 @@
 import requests
-import json
+import orjson
+import socket
 import time
+from fixtures import BASE_URL, body_text, make_session, pj
 
-BASE_URL = "http://localhost:5000/api"
+# One pooled keep-alive session for every request in the run
+session = make_session()
 
-def check_server():
-    """Check if the server is running"""
+SERVER_ADDR = ("127.0.0.1", 5000)
+
+def server_listening():
+    """Cheap TCP connect probe: True once something is accepting on the server port"""
+    try:
+        with socket.create_connection(SERVER_ADDR, timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+def check_server(attempts=20, delay=0.05):
+    """Wait briefly for the listener, then confirm the app itself answers /health"""
+    for _ in range(attempts):
+        if server_listening():
+            break
+        time.sleep(delay)
+    else:
+        return False
+    
     try:
-        response = requests.get("http://localhost:5000/api/health", timeout=2)
+        response = session.get(f"{BASE_URL}/health", timeout=2)
         return response.status_code == 200
-    except:
+    except requests.RequestException:
         return False
 
 def print_response(response):
-    """Pretty print the response"""
+    """Print the response status and body (pretty JSON with TEST_VERBOSE=1)"""
     print(f"Status: {response.status_code}")
-    try:
-        print(json.dumps(response.json(), indent=2))
-    except:
-        print(response.text)
+    print(body_text(response))
 
 # Check if server is running
 print("Checking if server is running...")
@@ -36,7 +53,7 @@ print("=" * 50)
 print("Test 1: Health Check")
 print("=" * 50)
 try:
-    response = requests.get("http://localhost:5000/api/health")
+    response = session.get(f"{BASE_URL}/health")
     print_response(response)
     print()
 except Exception as e:
@@ -59,12 +76,12 @@ signup_data = {
 print(f"Signing up with email: {signup_data['email']}")
 
 try:
-    response = requests.post(f"{BASE_URL}/auth/signup", json=signup_data)
+    response = session.post(f"{BASE_URL}/auth/signup", data=orjson.dumps(signup_data))
     print_response(response)
     
     if response.status_code == 201:
         print("\n✅ Signup successful!")
-        data = response.json()
+        data = pj(response)
         token = data['data']['session']['access_token']
         user_id = data['data']['user']['id']
         print(f"Token: {token[:50]}...")
@@ -76,7 +93,7 @@ try:
         print("=" * 50)
         
         headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{BASE_URL}/auth/me", headers=headers)
+        response = session.get(f"{BASE_URL}/auth/me", headers=headers)
         print_response(response)
         
         if response.status_code == 200:
@@ -94,7 +111,7 @@ try:
             "password": signup_data['password']
         }
         
-        response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
+        response = session.post(f"{BASE_URL}/auth/login", data=orjson.dumps(login_data))
         print_response(response)
         
         if response.status_code == 200:
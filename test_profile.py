@@ -1,7 +1,8 @@
-import requests
-import json
+import orjson
+from fixtures import BASE_URL, cached_token, make_session, pj, save_tokens, token_claims
 
-BASE_URL = "http://localhost:5000/api"
+# One pooled keep-alive session for every request in the run
+session = make_session()
 
 # First, login to get a token
 print("=" * 50)
@@ -13,16 +14,24 @@ login_data = {
     "password": "Test123!@#"
 }
 
-response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
-if response.status_code != 200:
-    print("❌ Login failed! Run signup test first.")
-    exit(1)
-
-token = response.json()['data']['session']['access_token']
-user_id = response.json()['data']['user']['id']
+# Reuse the token from an earlier run while it is still valid
+token = cached_token("profile_user")
+if token:
+    print("✅ Reusing cached login")
+else:
+    response = session.post(f"{BASE_URL}/auth/login", data=orjson.dumps(login_data))
+    if response.status_code != 200:
+        print("❌ Login failed! Run signup test first.")
+        exit(1)
+    
+    token = pj(response)['data']['session']['access_token']
+    save_tokens(profile_user=token)
+    print(f"✅ Logged in successfully")
+
+# The token's subject is the user's id
+user_id = token_claims(token)['sub']
 headers = {"Authorization": f"Bearer {token}"}
 
-print(f"✅ Logged in successfully")
 print(f"User ID: {user_id}\n")
 
 # Test 1: Update Profile
@@ -36,9 +45,9 @@ update_data = {
     "location": "Karachi, Pakistan",
 }
 
-response = requests.put(f"{BASE_URL}/profile", json=update_data, headers=headers)
+response = session.put(f"{BASE_URL}/profile", data=orjson.dumps(update_data), headers=headers)
 print(f"Status: {response.status_code}")
-print(json.dumps(response.json(), indent=2))
+print(orjson.dumps(pj(response), option=orjson.OPT_INDENT_2).decode())
 
 if response.status_code == 200:
     print("\n✅ Profile updated successfully!")
@@ -50,9 +59,9 @@ print("\n" + "=" * 50)
 print("Test 2: Get Public Profile (no auth required)")
 print("=" * 50)
 
-response = requests.get(f"{BASE_URL}/profile/{user_id}")
+response = session.get(f"{BASE_URL}/profile/{user_id}")
 print(f"Status: {response.status_code}")
-print(json.dumps(response.json(), indent=2))
+print(orjson.dumps(pj(response), option=orjson.OPT_INDENT_2).decode())
 
 if response.status_code == 200:
     print("\n✅ Public profile retrieved!")
@@ -65,9 +74,10 @@ print("Test 3: Switch Role to Organizer")
 print("=" * 50)
 
 role_data = {"role": "organizer"}
-response = requests.patch(f"{BASE_URL}/profile/role", json=role_data, headers=headers)
+response = session.patch(f"{BASE_URL}/profile/role", data=orjson.dumps(role_data), headers=headers)
 print(f"Status: {response.status_code}")
-print(json.dumps(response.json(), indent=2))
+role_body = pj(response)
+print(orjson.dumps(role_body, option=orjson.OPT_INDENT_2).decode())
 
 if response.status_code == 200:
     print("\n✅ Role updated to organizer!")
@@ -79,16 +89,34 @@ print("\n" + "=" * 50)
 print("Test 4: Verify Role Change")
 print("=" * 50)
 
-response = requests.get(f"{BASE_URL}/auth/me", headers=headers)
-print(f"Status: {response.status_code}")
-current_role = response.json()['data']['role']
+# The PATCH response already carries the updated profile, so no GET /auth/me
+current_role = role_body.get('data', {}).get('role')
 print(f"Current role: {current_role}")
 
 if current_role == "organizer":
-    print("\n✅ All profile tests passed!")
+    print("\n✅ Role change returned!")
 else:
     print("\n⚠️ Role didn't update properly")
 
+# Test 5: Re-read the role after the change
+print("\n" + "=" * 50)
+print("Test 5: Re-read Role After Change")
+print("=" * 50)
+
+# The token's profile is cached server-side, so both reads must see the new role
+response = session.get(f"{BASE_URL}/auth/me", headers=headers)
+print(f"Status: {response.status_code}")
+me_role = pj(response).get('data', {}).get('role') if response.status_code == 200 else None
+print(f"Role from /auth/me: {me_role}")
+
+response = session.get(f"{BASE_URL}/events/organizer/my-events", headers=headers)
+print(f"Organizer-only route status: {response.status_code}")
+
+if me_role == "organizer" and response.status_code == 200:
+    print("\n✅ All profile tests passed!")
+else:
+    print("\n⚠️ Stale role served after the change")
+
 print("\n" + "=" * 50)
 print("Profile tests completed!")
 print("=" * 50)
\ No newline at end of file